@@ -0,0 +1,34 @@
+"""add updated_at indexes
+
+Revision ID: a1c4e7f2b9d3
+Revises: 3446b337e19e
+Create Date: 2026-10-19 09:12:40.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7f2b9d3'
+down_revision: Union[str, Sequence[str], None] = '3446b337e19e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_outreach_reports_evangelist_id_updated_at', 'outreach_reports', ['evangelist_id', 'updated_at'], unique=False)
+    op.create_index('ix_outreach_reports_updated_at', 'outreach_reports', ['updated_at'], unique=False)
+    op.create_index('ix_people_report_id_updated_at', 'people', ['report_id', 'updated_at'], unique=False)
+    op.create_index('ix_people_updated_at', 'people', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_people_updated_at', table_name='people')
+    op.drop_index('ix_people_report_id_updated_at', table_name='people')
+    op.drop_index('ix_outreach_reports_updated_at', table_name='outreach_reports')
+    op.drop_index('ix_outreach_reports_evangelist_id_updated_at', table_name='outreach_reports')
@@ -0,0 +1,38 @@
+"""add sync tombstones
+
+Revision ID: e4b8f1c6a2d7
+Revises: c7d2e9a4f1b8
+Create Date: 2026-10-19 16:41:09.377520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8f1c6a2d7'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e9a4f1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_tombstones',
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('evangelist_id', sa.UUID(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'entity_id', 'evangelist_id')
+    )
+    op.create_index('ix_sync_tombstones_evangelist_id_deleted_at', 'sync_tombstones', ['evangelist_id', 'deleted_at'], unique=False)
+    op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_tombstones_deleted_at', table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_evangelist_id_deleted_at', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -1,9 +1,13 @@
-from fastapi import HTTPException, Depends, Header, Request, status
+from fastapi import HTTPException, Depends, Header, Request, WebSocket, WebSocketException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple, Annotated, AsyncGenerator    
+from typing import Optional, Tuple, Annotated, AsyncGenerator    
 from sqlalchemy import select       
-from app.core.database import get_db
+from app.core.database import get_db, get_session_factory
+from app.core.idempotency import IdempotentRequest, request_fingerprint
+from app.core.metrics import route_template
+from app.core.unit_of_work import get_uow
 from app.core.security import verify_token, get_token_remaining_time
+from app.core.tracing import traced
 from app.models.user import User, UserRole
 from app.models.outreachReport import OutreachReport
 from uuid import UUID
@@ -16,6 +20,7 @@ async def get_token_from_header(
         raise HTTPException(status_code=401, detail="Unauthorized")
     return authorization.split(" ")[1]  
 
+@traced("dependency get_current_user")
 async def get_current_user(
     request: Request,
     token: Annotated[str, Depends(get_token_from_header)],
@@ -96,6 +101,31 @@ async def get_current_user_from_request_without_token_with_token(
     return await get_current_user_from_request_with_token(request, db)
 
 
+async def get_websocket_token(websocket: WebSocket, token: Optional[str] = None) -> str:
+    """Token from the `token` query parameter (browsers cannot set headers on a WebSocket) or the header."""
+    authorization = websocket.headers.get("authorization")
+    if token is None and authorization and " " in authorization:
+        token = authorization.split(" ")[1]
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Unauthorized")
+    return token
+
+async def get_websocket_user(token: str = Depends(get_websocket_token)) -> User:
+    """
+    Get the user of a WebSocket. The session is closed again right away, so
+    a long-lived socket does not hold a pooled connection.
+    """
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token")
+    async with get_session_factory()() as db:
+        user = await db.execute(select(User).where(User.id == payload["sub"]))
+        user = user.scalar_one_or_none()
+    if user is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="User not found")
+    return user
+
+
 async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.admin:
         raise HTTPException(
@@ -119,6 +149,7 @@ async def require_any_authenticated_user(current_user: User = Depends(get_curren
 
 
 # verify report ownership
+@traced("dependency verify_report_ownership")
 async def verify_report_ownership(
    report_id: UUID,
    current_user: User = Depends(get_current_user),
@@ -151,4 +182,18 @@ async def verify_report_ownership(
     
     return report
 
-     
\ No newline at end of file
+
+async def idempotent_request(
+    request: Request,
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key")] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_uow, scope="function"),
+) -> IdempotentRequest:
+    """
+    Idempotency-Key support for create endpoints.
+    Keys are scoped per user; a repeated key replays the first response
+    (see app.core.idempotency.IdempotentRequest).
+    """
+    idempotent = IdempotentRequest(db, current_user.id, idempotency_key, route_template(request.scope))
+    await idempotent.begin(request_fingerprint(request.method, request.url.path, await request.body()))
+    return idempotent
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.unit_of_work import get_uow
+from app.core import pool_metrics
+from app.core.admission import admission
+from app.core.slow_query import slow_query_log
+from app.core.response_cache import CACHE_TAG_USERS, cache_scope, response_cache
 from app.api.dependencies import require_admin
 from app.models.user import User
 from app.schemas.user_schema import (
@@ -13,24 +19,34 @@ from app.schemas.user_schema import (
     UserStatusUpdateRequest
 )
 from app.services.admin_service import AdminService
+from app.utils.serialization import json_list_response
 
 router = APIRouter()
 
-def get_admin_service(db: AsyncSession = Depends(get_db)) -> AdminService:
+def get_admin_service(db: AsyncSession = Depends(get_uow, scope="function")) -> AdminService:
+    return AdminService(db)
+
+def get_admin_read_service(db: AsyncSession = Depends(get_read_db)) -> AdminService:
     return AdminService(db)
 
 @router.get("/users", response_model=List[UserSchema])
 async def list_users(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(require_admin),
-    service: AdminService = Depends(get_admin_service),
+    service: AdminService = Depends(get_admin_read_service),
 ):
     """
     List all users.
     Only accessible by admins.
+    Responses are cached and invalidated on user writes.
     """
-    return await service.list_users(skip, limit)
+    async def render():
+        users = await service.list_users(skip, limit)
+        return json_list_response(UserSchema, users)
+
+    return await response_cache.respond(request, cache_scope(current_user), (CACHE_TAG_USERS,), render)
 
 @router.post("/users", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 async def create_user(
@@ -69,3 +85,41 @@ async def update_user_status(
     Only accessible by admins.
     """
     return await service.update_user_status(user_id, status_update)
+
+@router.get("/pool-stats")
+async def pool_stats(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Live connection pool statistics for this worker.
+    Only accessible by admins.
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.registry.items()}
+
+
+@router.get("/admission")
+async def admission_stats(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Admission control state for this worker: in-flight and queued requests
+    per route class and the estimated pool wait.
+    Only accessible by admins.
+    """
+    return admission.snapshot()
+
+
+@router.get("/slow-queries")
+async def slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Slowest normalized statements seen by this worker since startup,
+    ordered by their worst duration.
+    Only accessible by admins.
+    """
+    return {
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "statements": slow_query_log.top(limit),
+    }
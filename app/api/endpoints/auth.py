@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..dependencies import get_current_user
 from app.models.user import User
 
-from app.core.database import get_db
+from app.core.unit_of_work import get_uow
 from app.schemas.user_schema import (
     LoginRequest,
     LoginResponse,
@@ -24,7 +24,7 @@ from app.models.user import UserRole
 router = APIRouter(tags=["auth"])
 
 
-def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
+def get_auth_service(db: AsyncSession = Depends(get_uow, scope="function")) -> AuthService:
     return AuthService(db)
 
 
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, WebSocket, WebSocketException, status
+
+from app.core.live_events import live_events
+from app.core.security import get_token_remaining_time
+from app.api.dependencies import get_websocket_token, get_websocket_user
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.websocket("/reports")
+async def report_events(
+    websocket: WebSocket,
+    token: str = Depends(get_websocket_token),
+    current_user: User = Depends(get_websocket_user),
+):
+    """
+    Push report and person changes instead of polling the listings.
+    - Connect with `?token=<access token>`; admins get every change, evangelists their own.
+    - Each message is a JSON array of events such as
+      {"type": "person", "op": "created", "id", "report_id", "evangelist_id", "updated_at"}.
+    - Subscribe first, then load the listing, so no change falls in between.
+    - On {"type": "resync"} or a "bulk" event, reload the listing.
+    - The socket is closed when the token expires (1008) or the client
+      cannot keep up (1013); reconnect with a fresh token.
+    """
+    if not live_events.enabled:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Live events are disabled")
+    subscriber = live_events.subscribe(current_user)
+    if subscriber is None:
+        raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many subscribers")
+    try:
+        await websocket.accept()
+        await live_events.stream(websocket, subscriber, lifetime=get_token_remaining_time(token))
+    finally:
+        live_events.unsubscribe(subscriber)
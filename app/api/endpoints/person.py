@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.core.database import get_read_db
+from app.core.idempotency import IdempotentRequest
+from app.core.unit_of_work import get_uow
+from app.core.response_cache import CACHE_TAG_PEOPLE, cache_scope, response_cache
+from app.api.dependencies import get_current_user, idempotent_request
 from app.models.user import User
 from app.models.person import Person
 from app.schemas.person_schema import PersonCreate, PersonUpdate, PersonResponse
 from app.services.person_service import PersonService
+from app.utils.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
+from app.utils.serialization import json_list_response
 
 router = APIRouter()
 
-def get_person_service(db: AsyncSession = Depends(get_db)) -> PersonService:
+def get_person_service(db: AsyncSession = Depends(get_uow, scope="function")) -> PersonService:
+    return PersonService(db)
+
+def get_person_read_service(db: AsyncSession = Depends(get_read_db)) -> PersonService:
     return PersonService(db)
 
 async def verify_person_ownership(
@@ -27,40 +40,67 @@ async def verify_person_ownership(
 
 @router.get("/", response_model=List[PersonResponse])
 async def list_people(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    service: PersonService = Depends(get_person_service),
+    service: PersonService = Depends(get_person_read_service),
 ):
     """
     List people.
     - Admins see all people.
     - Evangelists see only people from their reports.
+    Supports conditional GET via ETag (If-None-Match).
+    Responses are cached per role scope and invalidated on person writes.
     """
-    return await service.list_people(current_user, skip, limit)
+    async def render():
+        count, last_modified = await service.list_people_version(current_user)
+        etag = weak_etag("people", cache_scope(current_user), skip, limit, count, last_modified)
+        # ETag only: the newest updated_at does not move when a row is deleted,
+        # so Last-Modified / If-Modified-Since cannot validate a collection
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag, None)
+
+        people = await service.list_people(current_user, skip, limit)
+        return json_list_response(PersonResponse, people, headers=validator_headers(etag, None))
+
+    return await response_cache.respond(request, cache_scope(current_user), (CACHE_TAG_PEOPLE,), render)
 
 @router.post("/", response_model=PersonResponse, status_code=status.HTTP_201_CREATED)
 async def create_person(
     person_in: PersonCreate,
     current_user: User = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
+    idempotency: IdempotentRequest = Depends(idempotent_request),
 ):
     """
     Create a new person.
     Verifies that the user owns the report they are adding the person to.
+    Send an Idempotency-Key header to make retries safe: a repeated key replays the first response.
     """
-    return await service.create_person(person_in, current_user)
+    if idempotency.replay is not None:
+        return idempotency.replay
+    person = await service.create_person(person_in, current_user)
+    return await idempotency.respond(PersonResponse, person, status.HTTP_201_CREATED)
 
 @router.get("/{person_id}", response_model=PersonResponse)
 async def get_person(
     person_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
 ):
     """
     Get a specific person.
+    Supports conditional GET via ETag / Last-Modified.
     """
-    return await service.ensure_person_access(person_id, current_user)
+    person = await service.ensure_person_access(person_id, current_user)
+    etag = weak_etag("person", person.id, person.updated_at)
+    if is_not_modified(request, etag, person.updated_at):
+        return not_modified_response(etag, person.updated_at)
+    response.headers.update(validator_headers(etag, person.updated_at))
+    return person
 
 @router.put("/{person_id}", response_model=PersonResponse)
 async def update_person(
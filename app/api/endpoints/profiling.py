@@ -0,0 +1,103 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.api.dependencies import require_admin
+from app.core.profiling import cpu_profiler, memory_profiler
+from app.models.user import User
+
+router = APIRouter()
+
+# Every endpoint acts on the worker process that happens to serve the request.
+
+
+@router.get("/memory")
+async def memory_status(current_user: User = Depends(require_admin)):
+    """
+    tracemalloc state and RSS of this worker.
+    Only accessible by admins.
+    """
+    return memory_profiler.status()
+
+
+@router.post("/memory/start")
+async def start_memory_profiling(
+    frames: int = Query(1, ge=1, le=50),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Start tracemalloc (if not running) and take a new baseline snapshot.
+    More frames give tracebacks in diffs but cost more memory and CPU.
+    Only accessible by admins.
+    """
+    return memory_profiler.start(frames)
+
+
+@router.get("/memory/diff")
+async def memory_diff(
+    limit: int = Query(25, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    reset: bool = False,
+    current_user: User = Depends(require_admin),
+):
+    """
+    Top allocation growth since the baseline, by line, file or traceback.
+    With reset=true the current snapshot becomes the new baseline.
+    Only accessible by admins.
+    """
+    if not memory_profiler.running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Memory profiling is not running")
+    return {
+        **memory_profiler.status(),
+        "top": memory_profiler.diff(limit, group_by, reset),
+    }
+
+
+@router.post("/memory/stop")
+async def stop_memory_profiling(
+    limit: int = Query(25, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Return the final diff and stop tracemalloc, removing its overhead.
+    Only accessible by admins.
+    """
+    if not memory_profiler.running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Memory profiling is not running")
+    top = memory_profiler.diff(limit)
+    memory_profiler.stop()
+    return {"top": top}
+
+
+@router.get("/cpu")
+async def cpu_profile(
+    seconds: float = Query(10, gt=0, le=120),
+    mode: Literal["sampling", "cprofile"] = "sampling",
+    format: Literal["collapsed", "text", "pstats"] = "collapsed",
+    interval_ms: float = Query(5, ge=1, le=100),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Profile the event loop of this worker for `seconds` while it keeps serving.
+    - sampling: collapsed stacks (flamegraph.pl / speedscope input), low overhead
+    - cprofile: deterministic; returned as pstats text or a binary pstats dump
+    Only one profile runs at a time per worker.
+    Only accessible by admins.
+    """
+    if cpu_profiler.busy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A CPU profile is already running")
+
+    if mode == "sampling":
+        if format != "collapsed":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sampling profiles are returned as collapsed stacks")
+        return PlainTextResponse(await cpu_profiler.sample(seconds, interval_ms / 1000))
+
+    stats = await cpu_profiler.cprofile(seconds)
+    if format == "pstats":
+        return Response(
+            content=cpu_profiler.pstats_dump(stats),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return PlainTextResponse(cpu_profiler.pstats_text(stats))
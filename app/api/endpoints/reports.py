@@ -1,53 +1,92 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user, verify_report_ownership
+from app.core.database import get_read_db
+from app.core.idempotency import IdempotentRequest
+from app.core.unit_of_work import get_uow
+from app.core.response_cache import CACHE_TAG_REPORTS, cache_scope, response_cache
+from app.api.dependencies import get_current_user, idempotent_request, verify_report_ownership
 from app.models.user import User
 from app.models.outreachReport import OutreachReport
 from app.schemas.report_schema import ReportCreate, ReportUpdate, ReportResponse
 from app.services.report_service import ReportService
+from app.utils.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
+from app.utils.serialization import json_list_response
 
 router = APIRouter()
 
 
-def get_report_service(db: AsyncSession = Depends(get_db)) -> ReportService:
+def get_report_service(db: AsyncSession = Depends(get_uow, scope="function")) -> ReportService:
+    return ReportService(db)
+
+def get_report_read_service(db: AsyncSession = Depends(get_read_db)) -> ReportService:
     return ReportService(db)
 
 @router.get("/", response_model=List[ReportResponse])
 async def list_reports(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    service: ReportService = Depends(get_report_service),
+    service: ReportService = Depends(get_report_read_service),
 ):
     """
     List reports.
     - Admins see all reports.
     - Evangelists see only their own reports.
+    Supports conditional GET via ETag (If-None-Match).
+    Responses are cached per role scope and invalidated on report writes.
     """
-    return await service.list_reports(current_user, skip, limit)
+    async def render():
+        count, last_modified = await service.list_reports_version(current_user)
+        etag = weak_etag("reports", cache_scope(current_user), skip, limit, count, last_modified)
+        # ETag only: the newest updated_at does not move when a row is deleted,
+        # so Last-Modified / If-Modified-Since cannot validate a collection
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag, None)
+
+        reports = await service.list_reports(current_user, skip, limit)
+        return json_list_response(ReportResponse, reports, headers=validator_headers(etag, None))
+
+    return await response_cache.respond(request, cache_scope(current_user), (CACHE_TAG_REPORTS,), render)
 
 @router.post("/", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
 async def create_report(
     report_in: ReportCreate,
     current_user: User = Depends(get_current_user),
     service: ReportService = Depends(get_report_service),
+    idempotency: IdempotentRequest = Depends(idempotent_request),
 ):
     """
     Create a new outreach report.
+    Send an Idempotency-Key header to make retries safe: a repeated key replays the first response.
     """
-    return await service.create_report(report_in, current_user)
+    if idempotency.replay is not None:
+        return idempotency.replay
+    report = await service.create_report(report_in, current_user)
+    return await idempotency.respond(ReportResponse, report, status.HTTP_201_CREATED)
 
 @router.get("/{report_id}", response_model=ReportResponse)
 async def get_report(
+    request: Request,
+    response: Response,
     report: OutreachReport = Depends(verify_report_ownership)
 ):
     """
     Get a specific report by ID.
     Access is controlled by verify_report_ownership dependency.
+    Supports conditional GET via ETag / Last-Modified.
     """
+    etag = weak_etag("report", report.id, report.updated_at)
+    if is_not_modified(request, etag, report.updated_at):
+        return not_modified_response(etag, report.updated_at)
+    response.headers.update(validator_headers(etag, report.updated_at))
     return report
 
 @router.put("/{report_id}", response_model=ReportResponse)
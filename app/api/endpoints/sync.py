@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.idempotency import IdempotentRequest
+from app.core.unit_of_work import get_uow
+from app.api.dependencies import get_current_user, idempotent_request
+from app.models.user import User
+from app.schemas.sync_schema import SyncChanges, SyncUpload, SyncUploadResult
+from app.services.sync_service import SyncService
+
+router = APIRouter()
+
+
+def get_sync_service(db: AsyncSession = Depends(get_uow, scope="function")) -> SyncService:
+    return SyncService(db)
+
+# Always the primary: a replica cannot see the primary's open transactions and may not
+# have replayed recent commits, so its watermark could pass rows that are never synced
+def get_sync_read_service(db: AsyncSession = Depends(get_db)) -> SyncService:
+    return SyncService(db)
+
+@router.get("", response_model=SyncChanges)
+async def pull_changes(
+    since: Optional[datetime] = None,
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    service: SyncService = Depends(get_sync_read_service),
+):
+    """
+    Reports and people created, updated or deleted since the watermark.
+    - Omit `since` for a full sync; pass the returned watermark next time.
+    - While has_more is true, call again with the new watermark right away.
+    - A watermark older than the kept deletion history gets 410: sync from scratch.
+    - A page holds more than `limit` rows when more than that share one timestamp.
+    Rows can be sent again on a later call, so apply them as upserts.
+    """
+    changes = await service.changes(current_user, since, limit)
+    return Response(content=changes.model_dump_json(), media_type="application/json")
+
+@router.post("", response_model=SyncUploadResult)
+async def push_changes(
+    upload: SyncUpload,
+    current_user: User = Depends(get_current_user),
+    service: SyncService = Depends(get_sync_service),
+    idempotency: IdempotentRequest = Depends(idempotent_request),
+):
+    """
+    Upload offline changes in one transaction.
+    Reports and people are upserted by client-generated ids; send the updated_at
+    a change was based on to have it rejected as a conflict if the server copy
+    moved on since. Send an Idempotency-Key header to make retries safe.
+    """
+    if idempotency.replay is not None:
+        return idempotency.replay
+    result = await service.apply(current_user, upload)
+    return await idempotency.respond(SyncUploadResult, result)
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import pool_metrics
+from app.core.config import settings
+from app.core.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+ROUTE_AUTH = "auth"
+ROUTE_WRITE = "write"
+ROUTE_READ = "read"
+ROUTE_EXPORT = "export"
+
+# Never queued or shed: probes, scraping and the operator's own tools
+BYPASS_PATHS = ("/health", "/health/live", "/metrics", "/admin/invalidate-pool")
+BYPASS_PREFIXES = ("/api/admin/profiling/",)
+
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Weight of the newest sample in the moving average of request service time
+SERVICE_EWMA_ALPHA = 0.1
+
+
+def classify(scope: Scope, export_min_limit: int) -> Optional[str]:
+    """
+    Route class of a request, or None when it is always admitted.
+
+    Runs before routing, so it works from the method and path: auth
+    endpoints (bcrypt), other writes, list reads asking for more than
+    export_min_limit rows, and everything else.
+    """
+    path = scope["path"]
+    method = scope["method"]
+    if method == "OPTIONS" or path in BYPASS_PATHS or path.startswith(BYPASS_PREFIXES):
+        return None
+    if path.startswith("/api/auth/") and method == "POST":
+        return ROUTE_AUTH
+    if method in _WRITE_METHODS:
+        return ROUTE_WRITE
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    try:
+        limit = int(query.get("limit", ["0"])[-1])
+    except ValueError:
+        limit = 0
+    if limit > export_min_limit:
+        return ROUTE_EXPORT
+    return ROUTE_READ
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` requests in flight; up to `max_queue` more wait in FIFO
+    order. A released slot is handed straight to the oldest waiter.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.service_avg = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def full(self) -> bool:
+        return self.queued >= self.max_queue
+
+    def try_acquire(self) -> bool:
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for a slot; False when the deadline passes."""
+        if self.try_acquire():
+            return True
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        deadline = loop.call_later(timeout, lambda: waiter.done() or waiter.set_result(False))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # Granted just before the request was cancelled: pass the slot on
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            raise
+        finally:
+            deadline.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def observe_service(self, seconds: float) -> None:
+        if self.service_avg == 0.0:
+            self.service_avg = seconds
+        else:
+            self.service_avg += SERVICE_EWMA_ALPHA * (seconds - self.service_avg)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained."""
+        return max(1, math.ceil((self.queued + 1) * self.service_avg / max(1, self.limit)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "service_avg_seconds": round(self.service_avg, 6),
+        }
+
+
+class AdmissionController:
+    """
+    Per-route-class concurrency limits plus pool-aware load shedding.
+
+    A request is rejected up front with 503 when the primary pool's
+    estimated checkout wait is over pool_wait_budget, with 429 when its
+    class's queue is full, and with 503 when it waited queue_timeout without
+    getting a slot. Every rejection carries Retry-After, so under overload
+    clients back off quickly instead of all timing out on the pool together.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        max_queue: int,
+        queue_timeout: float,
+        pool_wait_budget: float,
+        export_min_limit: int,
+    ):
+        self.limiters = {name: ConcurrencyLimiter(name, limit, max_queue) for name, limit in limits.items()}
+        self.queue_timeout = queue_timeout
+        self.pool_wait_budget = pool_wait_budget
+        self.export_min_limit = export_min_limit
+
+    def pool_wait(self) -> float:
+        metrics = pool_metrics.registry.get("primary")
+        return metrics.estimated_wait() if metrics is not None else 0.0
+
+    async def admit(self, route_class: str) -> Tuple[Optional[ConcurrencyLimiter], Optional[Tuple[int, str, int]]]:
+        """Return (limiter, None) once admitted, or (None, (status, reason, retry_after))."""
+        limiter = self.limiters[route_class]
+        wait = self.pool_wait()
+        if self.pool_wait_budget > 0 and wait > self.pool_wait_budget:
+            return None, (503, "pool", max(1, math.ceil(wait)))
+        if limiter.try_acquire():
+            return limiter, None
+        if limiter.full:
+            return None, (429, "queue_full", limiter.retry_after())
+
+        start = time.perf_counter()
+        admitted = await limiter.acquire(self.queue_timeout)
+        ADMISSION_QUEUE_WAIT.labels(route_class).observe(time.perf_counter() - start)
+        if not admitted:
+            return None, (503, "queue_timeout", limiter.retry_after())
+        return limiter, None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pool_wait_estimate_seconds": round(self.pool_wait(), 6),
+            "pool_wait_budget_seconds": self.pool_wait_budget,
+            "queue_timeout_seconds": self.queue_timeout,
+            "classes": {name: limiter.snapshot() for name, limiter in self.limiters.items()},
+        }
+
+
+class AdmissionMiddleware:
+    """Apply the admission controller to every HTTP request."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope, self.controller.export_min_limit)
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter, rejection = await self.controller.admit(route_class)
+        if rejection is not None:
+            status_code, reason, retry_after = rejection
+            ADMISSION_REJECTIONS.labels(route_class, reason).inc()
+            logger.debug(f"Shedding {scope['method']} {scope['path']} ({route_class}, {reason})")
+            response = JSONResponse(
+                {"detail": "Server is busy, retry later"},
+                status_code=status_code,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.observe_service(time.perf_counter() - start)
+            limiter.release()
+
+
+admission = AdmissionController(
+    {
+        ROUTE_AUTH: settings.ADMISSION_LIMIT_AUTH,
+        ROUTE_WRITE: settings.ADMISSION_LIMIT_WRITE,
+        ROUTE_READ: settings.ADMISSION_LIMIT_READ,
+        ROUTE_EXPORT: settings.ADMISSION_LIMIT_EXPORT,
+    },
+    settings.ADMISSION_MAX_QUEUE,
+    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    settings.ADMISSION_POOL_WAIT_BUDGET_SECONDS,
+    settings.ADMISSION_EXPORT_MIN_LIMIT,
+)
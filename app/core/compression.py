@@ -0,0 +1,259 @@
+import zlib
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Compressible media types; entries ending in "/" match the whole family
+DEFAULT_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        import brotli
+
+        self._obj = brotli.Compressor(quality=quality, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        import zstandard
+
+        self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encoders(
+    gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3
+) -> Dict[str, Callable[[], object]]:
+    """
+    Encoder factories by content-coding, in server preference order.
+    brotli and zstd are used only when the optional `brotli` / `zstandard`
+    packages are installed; gzip is always available.
+    """
+    encoders: Dict[str, Callable[[], object]] = {}
+    try:
+        import zstandard  # noqa: F401
+
+        encoders["zstd"] = lambda: ZstdEncoder(zstd_level)
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+
+        encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+    except ImportError:
+        pass
+    encoders["gzip"] = lambda: GzipEncoder(gzip_level)
+    return encoders
+
+
+def choose_encoding(accept_encoding: str, supported: Iterable[str]) -> Optional[str]:
+    """
+    Pick the content-coding to use for an Accept-Encoding header.
+    Highest q-value wins; ties go to the order of `supported`.
+    """
+    supported = list(supported)
+    weights: Dict[str, float] = {}
+    wildcard: Optional[float] = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            wildcard = q
+        else:
+            weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress eligible responses with the best coding the client accepts.
+
+    Plain responses are compressed whole once they reach `minimum_size`.
+    Streaming responses are compressed chunk by chunk with a sync flush after
+    each one, so clients can decode rows as they arrive. Chunks of
+    `thread_size` bytes or more are compressed in a worker thread so a large
+    export does not stall the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        thread_size: int = 256 * 1024,
+        content_types: Tuple[str, ...] = DEFAULT_CONTENT_TYPES,
+        encoders: Optional[Dict[str, Callable[[], object]]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_size = thread_size
+        self.content_types = content_types
+        self.encoders = encoders if encoders is not None else available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept, self.encoders)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+    def compressible(self, content_type: str) -> bool:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return any(
+            media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+            for allowed in self.content_types
+        )
+
+
+class _CompressingResponder:
+    """The `send` callable handed to the app for one request."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._pass_through(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self._should_compress(headers, body, more_body):
+                await self._pass_through(message)
+                return
+            self.encoder = self.middleware.encoders[self.encoding]()
+            del headers["content-length"]
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("accept-encoding")
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                # The encoded bytes differ, so a strong validator no longer holds
+                headers["etag"] = f"W/{etag}"
+
+            if not more_body:
+                data = await self._encode(body, final=True)
+                headers["content-length"] = str(len(data))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            await self.send(self.start_message)
+
+        data = await self._encode(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _pass_through(self, message: Message) -> None:
+        self.passthrough = True
+        if self.start_message is not None:
+            await self.send(self.start_message)
+        await self.send(message)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        status = self.start_message["status"]
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        if not self.middleware.compressible(headers.get("content-type", "")):
+            return False
+        if not more_body:
+            return len(body) >= self.middleware.minimum_size
+        # Streams are judged by their declared length, if any; a small first chunk proves nothing
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.middleware.minimum_size
+
+    def _encode_sync(self, body: bytes, final: bool) -> bytes:
+        data = self.encoder.compress(body)
+        return data + (self.encoder.finish() if final else self.encoder.flush())
+
+    async def _encode(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= self.middleware.thread_size:
+            return await anyio.to_thread.run_sync(self._encode_sync, body, final)
+        return self._encode_sync(body, final)
@@ -1,7 +1,33 @@
+from typing import Literal, Optional, Tuple
 from pydantic_settings import BaseSettings
 
+
+def derive_pool_sizes(
+    max_connections: int,
+    workers: int,
+    reserved: int = 0,
+    overflow_ratio: float = 0.25,
+) -> Tuple[int, int]:
+    """
+    Split a global connection budget across worker processes.
+
+    Returns (pool_size, max_overflow) for a single worker so that
+    workers * (pool_size + max_overflow) + reserved <= max_connections.
+    """
+    per_worker = max(1, (max_connections - reserved) // max(1, workers))
+    max_overflow = int(per_worker * overflow_ratio)
+    pool_size = max(1, per_worker - max_overflow)
+    return pool_size, max_overflow
+
+
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_SSL: bool = True  # disable only for local databases/poolers without TLS
+    # Optional read replica for list/analytics queries
+    DATABASE_READ_URL: Optional[str] = None
+    DB_READ_STICKY_SECONDS: float = 5.0  # read from primary this long after a client writes
+    DB_READ_RETRY_SECONDS: float = 30.0  # skip the replica this long after it fails
+    DB_READ_CONNECT_TIMEOUT: float = 3.0
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -12,6 +38,175 @@ class Settings(BaseSettings):
     SMTP_SERVER: str
     SMTP_PORT: str
 
+    # Per-worker pool settings, used as-is unless DB_MAX_CONNECTIONS is set
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    # Global connection budget shared by WEB_CONCURRENCY workers; connections
+    # kept aside for migrations, scripts and other tools go in DB_RESERVED_CONNECTIONS
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    DB_RESERVED_CONNECTIONS: int = 2
+    WEB_CONCURRENCY: int = 1
+
+    # Connection liveness on checkout: "pre_ping" pings every checkout,
+    # "idle_ping" only connections idle longer than DB_IDLE_PING_SECONDS, "none" never
+    DB_LIVENESS: Literal["pre_ping", "idle_ping", "none"] = "idle_ping"
+    DB_IDLE_PING_SECONDS: float = 30.0
+    # Background keepalive so Neon compute stays awake between the given UTC hours; 0 disables
+    DB_KEEPALIVE_SECONDS: int = 0
+    DB_KEEPALIVE_START_HOUR: int = 5
+    DB_KEEPALIVE_END_HOUR: int = 17
+
+    # Set when DATABASE_URL points at a transaction-mode pooler (Neon "-pooler" host / PgBouncer).
+    # DB_POOLER_POOL is "null" (no local pooling) or "small" (DB_POOLER_POOL_SIZE connections)
+    DB_POOLER_MODE: bool = False
+    DB_POOLER_POOL: Literal["null", "small"] = "null"
+    DB_POOLER_POOL_SIZE: int = 2
+
+    # Response cache for listing endpoints: "memory" (per-process LRU), "redis" (shared store
+    # at RESPONSE_CACHE_URL, needs the redis package) or "none". Entries are fresh for
+    # RESPONSE_CACHE_TTL seconds, then served stale for up to RESPONSE_CACHE_STALE_TTL while refreshing
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    RESPONSE_CACHE_URL: Optional[str] = None
+    RESPONSE_CACHE_TTL: float = 5.0
+    RESPONSE_CACHE_STALE_TTL: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Cross-worker cache invalidation over LISTEN/NOTIFY. LISTEN needs a session-level
+    # connection, so point DATABASE_LISTEN_URL at a direct (non-pooler) endpoint in pooler mode
+    INVALIDATION_BUS_ENABLED: bool = True
+    DATABASE_LISTEN_URL: Optional[str] = None
+    INVALIDATION_CHANNEL: str = "evang_invalidate"
+    INVALIDATION_HEALTHCHECK_SECONDS: float = 60.0
+
+    # Change events pushed to dashboards over /api/ws/reports: "memory" (only subscribers of
+    # the worker that wrote), "postgres" (every worker, over the invalidation bus) or "none".
+    # A subscriber LIVE_EVENTS_QUEUE_SIZE events behind is told to resync; one whose socket
+    # takes nothing for LIVE_EVENTS_SEND_TIMEOUT_SECONDS is disconnected
+    LIVE_EVENTS_BACKEND: Literal["memory", "postgres", "none"] = "memory"
+    LIVE_EVENTS_QUEUE_SIZE: int = 256
+    LIVE_EVENTS_SEND_TIMEOUT_SECONDS: float = 10.0
+    LIVE_EVENTS_MAX_SUBSCRIBERS: int = 500
+
+    # Response compression. Bodies under COMPRESSION_MIN_SIZE bytes are sent as-is;
+    # chunks over COMPRESSION_THREAD_SIZE are compressed off the event loop
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_THREAD_SIZE: int = 256 * 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Server-Timing header with per-request db-count/db-time/auth-time/app-time.
+    # QUERY_LOG_THRESHOLD > 0 also logs requests running more queries than that
+    SERVER_TIMING_ENABLED: bool = False
+    SERVER_TIMING_QUERY_LOG_THRESHOLD: int = 0
+
+    # Prometheus /metrics. Set METRICS_TOKEN to require "Authorization: Bearer <token>".
+    # Multi-worker setups also need PROMETHEUS_MULTIPROC_DIR in the environment
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    METRICS_POOL_SAMPLE_SECONDS: float = 5.0
+
+    # Threads hashing/verifying passwords with bcrypt, off the event loop
+    BCRYPT_WORKERS: int = 2
+
+    # Slow-query log; 0 disables it. A sample of slow SELECTs is EXPLAINed and the
+    # JSON plans go to a rotating file
+    SLOW_QUERY_MS: float = 500.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_PLAN_FILE: str = "logs/slow_query_plans.jsonl"
+    SLOW_QUERY_PLAN_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_PLAN_FILE_BACKUPS: int = 5
+    SLOW_QUERY_MAX_STATEMENTS: int = 200
+
+    # Request tracing. Spans go to a local JSON-lines file or an OTLP/HTTP collector
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.1
+    TRACING_EXPORTER: Literal["file", "otlp"] = "file"
+    TRACING_FILE: str = "logs/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "evang_tracker_api"
+
+    # Production launcher (python -m app.server). Keep-alive should outlast the
+    # load balancer's idle timeout so it never reuses a connection we just closed
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 65
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    # X-Forwarded-For/Proto are only trusted from these addresses; set it to the load
+    # balancer's address (comma-separated list or CIDR), never "*" on a public listener
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Workers restart after WORKER_MAX_REQUESTS (+ random jitter) requests or once
+    # their RSS passes WORKER_MAX_RSS_MB; 0 disables each limit
+    WORKER_MAX_REQUESTS: int = 0
+    WORKER_MAX_REQUESTS_JITTER: int = 0
+    WORKER_MAX_RSS_MB: int = 0
+    WORKER_RSS_CHECK_SECONDS: float = 15.0
+
+    # Admission control: concurrent requests per route class, each with a FIFO queue of
+    # ADMISSION_MAX_QUEUE waiting at most ADMISSION_QUEUE_TIMEOUT_SECONDS. Requests are
+    # shed with 503 while the estimated pool checkout wait is over the budget (0 disables
+    # that check). List requests with limit above ADMISSION_EXPORT_MIN_LIMIT count as export
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMIT_AUTH: int = 8
+    ADMISSION_LIMIT_WRITE: int = 32
+    ADMISSION_LIMIT_READ: int = 64
+    ADMISSION_LIMIT_EXPORT: int = 4
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    ADMISSION_POOL_WAIT_BUDGET_SECONDS: float = 2.0
+    ADMISSION_EXPORT_MIN_LIMIT: int = 500
+
+    # statement_timeout per route class (see ADMISSION_*), 0 for no limit. Direct
+    # connections start with the read budget, other classes use SET LOCAL per transaction.
+    # CANCEL_ON_DISCONNECT cancels a GET/HEAD and its query when the client goes away
+    STATEMENT_TIMEOUT_READ_MS: int = 10000
+    STATEMENT_TIMEOUT_WRITE_MS: int = 10000
+    STATEMENT_TIMEOUT_AUTH_MS: int = 5000
+    STATEMENT_TIMEOUT_EXPORT_MS: int = 60000
+    CANCEL_ON_DISCONNECT: bool = True
+
+    # Requests failing with a transient database error (connection lost, compute waking,
+    # serialization failure) are re-run up to DB_RETRY_MAX_ATTEMPTS times in total, with
+    # jittered exponential backoff, within DB_RETRY_BUDGET_SECONDS; 1 disables retries
+    DB_RETRY_MAX_ATTEMPTS: int = 3
+    DB_RETRY_BASE_DELAY_SECONDS: float = 0.1
+    DB_RETRY_MAX_DELAY_SECONDS: float = 2.0
+    DB_RETRY_BUDGET_SECONDS: float = 5.0
+
+    # Responses to create requests sent with an Idempotency-Key are kept this long; expired
+    # keys are deleted every IDEMPOTENCY_GC_INTERVAL_SECONDS (0 disables) in batches
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_GC_INTERVAL_SECONDS: int = 3600
+    IDEMPOTENCY_GC_BATCH_SIZE: int = 1000
+
+    # Delta sync stops SYNC_SETTLE_SECONDS before now and before the oldest write transaction
+    # still open, so its rows are not skipped; the margin covers clock skew between app and
+    # database. Deletions are kept SYNC_TOMBSTONE_TTL_DAYS; older watermarks get 410
+    SYNC_SETTLE_SECONDS: int = 5
+    SYNC_PAGE_SIZE: int = 500
+    SYNC_MAX_PAGE_SIZE: int = 2000
+    SYNC_TOMBSTONE_TTL_DAYS: int = 90
+    SYNC_TOMBSTONE_GC_INTERVAL_SECONDS: int = 3600
+    SYNC_TOMBSTONE_GC_BATCH_SIZE: int = 1000
+
+    # Seconds between alembic_version checks; 0 disables the watcher
+    SCHEMA_VERSION_CHECK_SECONDS: int = 30
+
+    def pool_sizes(self) -> Tuple[int, int]:
+        """Return (pool_size, max_overflow) for this worker."""
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_POOL_SIZE, self.DB_MAX_OVERFLOW
+        # Each worker also holds one LISTEN connection for the invalidation bus
+        listeners = self.WEB_CONCURRENCY if self.INVALIDATION_BUS_ENABLED else 0
+        return derive_pool_sizes(
+            self.DB_MAX_CONNECTIONS,
+            self.WEB_CONCURRENCY,
+            reserved=self.DB_RESERVED_CONNECTIONS + listeners,
+        )
 
     class Config:
         env_file = ".env"
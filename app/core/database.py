@@ -1,12 +1,27 @@
+import asyncio
+import hashlib
 import ssl
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import time
+from functools import lru_cache
+from uuid import uuid4
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.liveness import ComputeKeepalive, install_idle_ping
+from app.core.pool_metrics import PoolMetrics, install_pool_listeners, instrumented_pool_class
+from app.core.request_timing import install_query_timing
+from app.core.metrics import install_engine_metrics
+from app.core.slow_query import slow_query_log
+from app.core.tracing import install_statement_tracing
+from app.core.statement_timeout import SESSION_TIMEOUT_KEY, install_default_timeout, statement_timeout_for
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 # Logging
 logger = logging.getLogger(__name__)
@@ -18,73 +33,313 @@ Base = declarative_base()
 # -----------------------------
 # Async Engine Setup (Neon + asyncpg)
 # -----------------------------
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=False,
-        future=True
-    )
-else:
-    # SSL context for Neon
+def create_ssl_context() -> ssl.SSLContext:
+    """SSL context for Neon."""
     ssl_context = ssl.create_default_context()
     ssl_context.check_hostname = True
     ssl_context.verify_mode = ssl.CERT_REQUIRED
+    return ssl_context
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_engine(
+    database_url: str,
+    pooler_mode: Optional[bool] = None,
+    use_ssl: Optional[bool] = None,
+    name: str = "primary",
+    liveness: Optional[str] = None,
+    connect_timeout: Optional[float] = None,
+) -> AsyncEngine:
+    """
+    Build an async engine for the given URL.
+
+    With pooler_mode (defaults to settings.DB_POOLER_MODE) the engine is safe
+    behind a transaction-mode PgBouncer such as Neon's pooled endpoint:
+    consecutive transactions may land on different server connections, so
+    prepared statements are not cached and get unique names, and liveness
+    checks are left to the pooler. Otherwise liveness (defaults to
+    settings.DB_LIVENESS) selects how connections are checked on checkout.
+
+    Pool statistics are collected under `name` in app.core.pool_metrics.registry.
+    """
+    metrics = PoolMetrics(name)
+
+    if database_url.startswith("sqlite"):
+        engine = create_async_engine(
+            database_url,
+            echo=False,
+            future=True
+        )
+        install_pool_listeners(engine, metrics)
+        if settings.METRICS_ENABLED:
+            install_engine_metrics(engine, metrics)
+        if settings.SERVER_TIMING_ENABLED:
+            install_query_timing(engine)
+        if slow_query_log.enabled:
+            slow_query_log.install(engine)
+        if settings.TRACING_ENABLED:
+            install_statement_tracing(engine)
+        return engine
+
+    if pooler_mode is None:
+        pooler_mode = settings.DB_POOLER_MODE
+    if use_ssl is None:
+        use_ssl = settings.DATABASE_SSL
+    if liveness is None:
+        liveness = settings.DB_LIVENESS
+
+    connect_args = {
+        "server_settings": {
+            "application_name": "evang_tracker_api",
+        }
+    }
+    if not pooler_mode and settings.STATEMENT_TIMEOUT_READ_MS:
+        # Transaction poolers reject most startup parameters
+        connect_args["server_settings"]["statement_timeout"] = str(settings.STATEMENT_TIMEOUT_READ_MS)
+    if connect_timeout is not None:
+        connect_args["timeout"] = connect_timeout
+    if use_ssl:
+        connect_args["ssl"] = create_ssl_context()
 
     engine_kwargs = {
         "echo": False,
         "future": True,
-        "pool_size": 10,
-        "max_overflow": 5,
-        "pool_timeout": 30,
-        "pool_pre_ping": True,
-        "pool_recycle": 3600,
-        "connect_args": {
-            "ssl": ssl_context,
-            "server_settings": {
-                "application_name": "evang_tracker_api",
-            }
-        },
+        "connect_args": connect_args,
     }
 
+    if pooler_mode:
+        connect_args["statement_cache_size"] = 0  # asyncpg's own cache
+        connect_args["prepared_statement_cache_size"] = 0  # SQLAlchemy's cache
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+        if settings.DB_POOLER_POOL == "null":
+            engine_kwargs["poolclass"] = NullPool
+        else:
+            engine_kwargs.update({
+                "poolclass": instrumented_pool_class(metrics),
+                "pool_size": settings.DB_POOLER_POOL_SIZE,
+                "max_overflow": 0,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+            })
+    else:
+        pool_size, max_overflow = settings.pool_sizes()
+        engine_kwargs.update({
+            "poolclass": instrumented_pool_class(metrics),
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_pre_ping": liveness == "pre_ping",
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        })
+
     engine = create_async_engine(
-        settings.DATABASE_URL.split("?")[0],  # remove sslmode & channel_binding from URL
+        database_url.split("?")[0],  # remove sslmode & channel_binding from URL
         **engine_kwargs
     )
+    install_pool_listeners(engine, metrics)
+    if settings.METRICS_ENABLED:
+        install_engine_metrics(engine, metrics)
+    if settings.SERVER_TIMING_ENABLED:
+        install_query_timing(engine)
+    if slow_query_log.enabled:
+        slow_query_log.install(engine)
+    if settings.TRACING_ENABLED:
+        install_statement_tracing(engine)
+    if not pooler_mode and settings.STATEMENT_TIMEOUT_READ_MS:
+        install_default_timeout(engine, settings.STATEMENT_TIMEOUT_READ_MS)
+    if not pooler_mode and liveness == "idle_ping":
+        install_idle_ping(engine, settings.DB_IDLE_PING_SECONDS)
+    return engine
+
+
+class WriteTrackingSession(Session):
+    """Session that remembers whether it flushed any changes."""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+# Engines and session factories are built on first use, so importing the app
+# (alembic, scripts, a cold start serving /health/live) does not create them.
+@lru_cache(maxsize=None)
+def get_engine() -> AsyncEngine:
+    return build_engine(settings.DATABASE_URL)
+
+
+@lru_cache(maxsize=None)
+def get_session_factory() -> sessionmaker:
+    return sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        sync_session_class=WriteTrackingSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Optional read replica for list and analytics queries
+@lru_cache(maxsize=None)
+def get_read_engine() -> Optional[AsyncEngine]:
+    if not settings.DATABASE_READ_URL:
+        return None
+    return build_engine(
+        settings.DATABASE_READ_URL,
+        name="replica",
+        connect_timeout=settings.DB_READ_CONNECT_TIMEOUT,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_read_session_factory() -> Optional[sessionmaker]:
+    read_engine = get_read_engine()
+    if read_engine is None:
+        return None
+    return sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_keepalive() -> ComputeKeepalive:
+    return ComputeKeepalive(
+        get_engine(),
+        settings.DB_KEEPALIVE_SECONDS,
+        settings.DB_KEEPALIVE_START_HOUR,
+        settings.DB_KEEPALIVE_END_HOUR,
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "AsyncSessionLocal": get_session_factory,
+    "read_engine": get_read_engine,
+    "AsyncReadSessionLocal": get_read_session_factory,
+    "keepalive": get_keepalive,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # `from app.core.database import engine` keeps working; the engine is built then
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
+
+
+class ReplicaRouter:
+    """
+    Decide whether a read can go to the replica.
+
+    Clients that wrote within the sticky window read from the primary so they
+    see their own writes despite replication lag, and the replica is skipped
+    for a while after it fails to connect. State is per worker process.
+    """
+
+    def __init__(self, sticky_seconds: float, retry_seconds: float):
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._writers: Dict[str, float] = {}
+        self._down_until = 0.0
+
+    @staticmethod
+    def client_key(request: Request) -> str:
+        auth = request.headers.get("authorization")
+        if auth:
+            # A digest, so live bearer tokens are not kept in memory
+            return hashlib.blake2b(auth.encode(), digest_size=16).hexdigest()
+        return request.client.host if request.client else ""
+
+    def record_write(self, request: Request) -> None:
+        now = time.monotonic()
+        if len(self._writers) > 10_000:
+            self._writers = {k: v for k, v in self._writers.items() if v > now}
+        self._writers[self.client_key(request)] = now + self.sticky_seconds
+
+    def use_replica(self, request: Request) -> bool:
+        if get_read_session_factory() is None:
+            return False
+        now = time.monotonic()
+        if now < self._down_until:
+            return False
+        return self._writers.get(self.client_key(request), 0.0) <= now
+
+    def mark_down(self, error: Exception) -> None:
+        logger.warning(f"Read replica unavailable, using primary for {self.retry_seconds:.0f}s: {error}")
+        self._down_until = time.monotonic() + self.retry_seconds
+
+
+replica_router = ReplicaRouter(settings.DB_READ_STICKY_SECONDS, settings.DB_READ_RETRY_SECONDS)
 
-# Session factory
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
 
 # FastAPI dependency
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session.
     
-    Note: If you encounter InvalidCachedStatementError after running migrations,
-    restart the FastAPI server to clear the connection pool cache.
-    Alternatively, call invalidate_connection_pool() to clear cached statements.
+    Note: Schema changes from Alembic migrations are picked up by the
+    SchemaVersionWatcher, which resets cached prepared statements on the
+    pooled connections. reset_statement_caches() can also be called directly.
     """
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
+        session.info[SESSION_TIMEOUT_KEY] = statement_timeout_for(request.scope)
         try:
             yield session
         finally:
+            if session.info.get("wrote"):
+                replica_router.record_write(request)
             await session.close()
 
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a session for read-only queries.
+
+    Served by the read replica when DATABASE_READ_URL is set, unless this
+    client wrote recently or the replica is unreachable; otherwise the
+    request's primary session is reused.
+    """
+    if not replica_router.use_replica(request):
+        yield db
+        return
+
+    session = get_read_session_factory()()
+    session.info[SESSION_TIMEOUT_KEY] = db.info[SESSION_TIMEOUT_KEY]
+    try:
+        await session.connection()
+    except (OSError, SQLAlchemyError, asyncio.TimeoutError) as e:
+        await session.close()
+        replica_router.mark_down(e)
+        yield db
+        return
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
 # DB Initialization
 async def init_db():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created successfully.")
 
 # PostgreSQL Extensions
 async def create_db_extensions():
     try:
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";'))
             await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pgcrypto;'))
         logger.info("✅ PostgreSQL extensions created successfully.")
@@ -93,13 +348,13 @@ async def create_db_extensions():
 
 # Utilities
 async def drop_all_tables():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
     logger.warning("⚠ All tables dropped (development/testing only).")
 
 async def check_db_connection() -> bool:
     try:
-        async with engine.connect() as conn:
+        async with get_engine().connect() as conn:
             result = await conn.execute(text("SELECT 1"))
             # fetch one row in async style
             row = result.first()
@@ -109,18 +364,45 @@ async def check_db_connection() -> bool:
         logger.error(f"Database connection failed: {e}")
         return False
 
+# Utility function to reset prepared statement caches
+def _engines() -> List[AsyncEngine]:
+    """The primary engine and, when configured, the read replica's."""
+    read_engine = get_read_engine()
+    return [get_engine()] if read_engine is None else [get_engine(), read_engine]
+
+
+def reset_statement_caches() -> bool:
+    """
+    Mark the prepared statement and type caches of every pooled connection,
+    on the primary and the read replica, as stale. Connections stay open;
+    each one reloads its schema state and re-prepares its statements on next
+    use instead of reconnecting.
+
+    Returns False when the dialect has no statement cache (e.g. sqlite).
+    """
+    invalidators = [getattr(engine.dialect, "_invalidate_schema_cache", None) for engine in _engines()]
+    invalidators = [invalidate for invalidate in invalidators if invalidate is not None]
+    if not invalidators:
+        return False
+    for invalidate in invalidators:
+        invalidate()
+    logger.info("✅ Prepared statement caches reset. Connections will re-prepare on next use.")
+    return True
+
 # Utility function to invalidate connection pool
 async def invalidate_connection_pool():
     """
-    Invalidate the connection pool to clear cached prepared statements.
-    Call this after running Alembic migrations while the server is running.
+    Dispose the connection pool, closing every pooled connection.
+    Prefer reset_statement_caches() after migrations; this forces every
+    connection to be re-established and is only needed as a last resort.
     
     Usage:
         from app.core.database import invalidate_connection_pool
         await invalidate_connection_pool()
     """
     logger.info("Invalidating connection pool to clear cached statements...")
-    await engine.dispose()
+    for engine in _engines():
+        await engine.dispose()
     logger.info("✅ Connection pool invalidated. New connections will be created on next request.")
 
 # Database Manager
@@ -138,5 +420,5 @@ class DatabaseManager:
     
     @staticmethod
     async def invalidate_pool():
-        """Invalidate connection pool after schema changes."""
-        await invalidate_connection_pool()
+        """Reset cached prepared statements after schema changes."""
+        reset_statement_caches()
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import CLIENT_DISCONNECTS, route_template
+
+logger = logging.getLogger(__name__)
+
+# Only reads are cancelled: a write runs to completion so its commit and the
+# cache invalidation that follows it are never split
+CANCELLABLE_METHODS = {"GET", "HEAD"}
+
+# nginx's "client closed request"; nobody receives it, but metrics and access logs see it
+STATUS_CLIENT_CLOSED = 499
+
+
+class DisconnectCancelMiddleware:
+    """
+    Cancel a read request as soon as its client disconnects.
+
+    A watcher task forwards the client's messages to the app and cancels the
+    handler on http.disconnect, which cancels the in-flight asyncpg query
+    and closes the request's session, so the pooled connection is returned
+    right away instead of when the abandoned query finishes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in CANCELLABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+        response_complete = False
+        disconnected = False
+        request_task = asyncio.current_task()
+        messages: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def watch_client() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect" and not response_complete:
+                    disconnected = True
+                    request_task.cancel()
+                    return
+                await messages.put(message)
+
+        watcher = asyncio.create_task(watch_client())
+        try:
+            await self.app(scope, messages.get, send_wrapper)
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            request_task.uncancel()
+        finally:
+            watcher.cancel()
+
+        if disconnected:
+            CLIENT_DISCONNECTS.labels(route_template(scope)).inc()
+            logger.info(f"Client disconnected, cancelled {scope['method']} {scope['path']}")
+            if not response_started:
+                await Response(status_code=STATUS_CLIENT_CLOSED)(scope, receive, send)
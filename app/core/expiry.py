@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import Column, Table, delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiredRowCollector:
+    """
+    Periodically delete the rows of a table whose `column` is before cutoff().
+
+    Rows go in batches of batch_size by primary key. Every batch is its own
+    short transaction, and rows another worker is already deleting are
+    skipped, so collection never holds long locks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        engine_factory: Callable[[], AsyncEngine],
+        table: Table,
+        column: Column,
+        cutoff: Callable[[], datetime],
+        interval: int,
+        batch_size: int,
+    ):
+        self.name = name
+        self.engine_factory = engine_factory
+        self.table = table
+        self.column = column
+        self.cutoff = cutoff
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    async def collect(self) -> int:
+        """Delete every expired row; returns how many were deleted."""
+        engine = self.engine_factory()
+        key = tuple_(*self.table.primary_key.columns)
+        total = 0
+        while True:
+            expired = (
+                select(*self.table.primary_key.columns)
+                .where(self.column < self.cutoff())
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            async with engine.begin() as conn:
+                result = await conn.execute(delete(self.table).where(key.in_(expired)))
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                break
+            await asyncio.sleep(0)
+        if total:
+            logger.info(f"Collected {total} expired {self.name}")
+        return total
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.warning(f"Could not collect expired {self.name}: {e}")
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,133 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Type
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.core.expiry import ExpiredRowCollector
+from app.core.metrics import IDEMPOTENT_REPLAYS
+from app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> bytes:
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.digest()
+
+
+async def claim_key(session: AsyncSession, user_id: UUID, key: str, fingerprint: bytes) -> bool:
+    """
+    Claim (user_id, key) in the session's transaction; False if it is taken.
+
+    A duplicate arriving while the first request is still running blocks on
+    the uncommitted row until that transaction ends: it then finds the
+    stored response, or claims the key itself if the first one rolled back.
+    Expired keys that were not collected yet are taken over.
+    """
+    now = datetime.now(timezone.utc)
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        fingerprint=fingerprint,
+        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "expires_at": stmt.excluded.expires_at,
+            "status_code": None,
+            "response_body": None,
+        },
+        where=IdempotencyKey.expires_at < now,
+    ).returning(IdempotencyKey.key)
+    claimed = (await session.execute(stmt)).first() is not None
+    if claimed:
+        session.info["wrote"] = True
+    return claimed
+
+
+class IdempotentRequest:
+    """
+    Idempotency-Key handling for one create request.
+
+    When the key was already used, `replay` holds the stored response and
+    the endpoint returns it without doing any work. Otherwise the endpoint
+    builds its response with respond(), which stores it alongside the
+    created rows, in the same commit.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: UUID, key: Optional[str], route: str):
+        self.session = session
+        self.user_id = user_id
+        self.key = key
+        self.route = route
+        self.replay: Optional[Response] = None
+
+    async def begin(self, fingerprint: bytes) -> None:
+        if self.key is None:
+            return
+        if len(self.key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key is longer than {IDEMPOTENCY_KEY_MAX_LENGTH} characters",
+            )
+        if await claim_key(self.session, self.user_id, self.key, fingerprint):
+            return
+
+        result = await self.session.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response_body)
+            .where(IdempotencyKey.user_id == self.user_id, IdempotencyKey.key == self.key)
+        )
+        stored = result.one_or_none()
+        if stored is None or stored.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        IDEMPOTENT_REPLAYS.labels(self.route).inc()
+        self.replay = Response(
+            content=stored.response_body,
+            status_code=stored.status_code,
+            headers={REPLAYED_HEADER: "true"},
+            media_type="application/json",
+        )
+
+    async def respond(self, model: Type[BaseModel], row, status_code: int = status.HTTP_200_OK) -> Response:
+        """Serialize row as model and, with a key, store it as the response to replay."""
+        body = model.model_validate(row, from_attributes=True).model_dump_json().encode()
+        if self.key is not None:
+            await self.session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == self.user_id, IdempotencyKey.key == self.key)
+                .values(status_code=status_code, response_body=body)
+            )
+        return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+idempotency_collector = ExpiredRowCollector(
+    "idempotency keys",
+    get_engine,
+    IdempotencyKey.__table__,
+    IdempotencyKey.expires_at,
+    lambda: datetime.now(timezone.utc),
+    settings.IDEMPOTENCY_GC_INTERVAL_SECONDS,
+    settings.IDEMPOTENCY_GC_BATCH_SIZE,
+)
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import create_ssl_context
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+ResyncHandler = Callable[[], Awaitable[None]]
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Turn a SQLAlchemy URL into a plain asyncpg DSN (driver suffix and query removed)."""
+    url = make_url(database_url).set(drivername="postgresql", query={})
+    return url.render_as_string(hide_password=False)
+
+
+class InvalidationBus:
+    """
+    Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    publish() issues pg_notify inside the caller's transaction, so an event is
+    delivered only if the write commits. Each worker keeps one dedicated
+    asyncpg connection LISTENing on the channel and dispatches events to the
+    handlers subscribed to their topic. Events published by this worker are
+    skipped because the publisher applies them locally after commit. After a
+    reconnect, events may have been missed, so resync handlers run to drop
+    whatever local state could be stale.
+    """
+
+    def __init__(self, dsn: Optional[str], channel: str, healthcheck_seconds: float):
+        self.dsn = dsn
+        self.channel = channel
+        self.healthcheck_seconds = healthcheck_seconds
+        self.origin = uuid4().hex
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._resync_handlers: List[ResyncHandler] = []
+        self._task: Optional[asyncio.Task] = None
+        # Dispatches in flight; the loop only keeps weak references to tasks
+        self._dispatching: Set[asyncio.Task] = set()
+        self._conn: Optional["asyncpg.Connection"] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.dsn is not None
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def on_resync(self, handler: ResyncHandler) -> None:
+        self._resync_handlers.append(handler)
+
+    async def publish(self, session: AsyncSession, topic: str, **data: Any) -> None:
+        """Queue an event in the session's transaction; it is sent on commit and dropped on rollback."""
+        if not self.enabled or session.get_bind().dialect.name != "postgresql":
+            return
+        payload = json.dumps({"o": self.origin, "t": topic, "d": data})
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload},
+        )
+
+    async def dispatch(self, topic: str, data: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                await handler(data)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {topic!r} failed: {e}")
+
+    async def resync(self) -> None:
+        for handler in self._resync_handlers:
+            try:
+                await handler()
+            except Exception as e:
+                logger.error(f"Invalidation resync handler failed: {e}")
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload[:200]}")
+            return
+        if event.get("o") == self.origin:
+            return
+        task = asyncio.get_running_loop().create_task(self.dispatch(event.get("t"), event.get("d") or {}))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _connect(self) -> "asyncpg.Connection":
+        # Imported here so the driver is only loaded where the bus is enabled
+        import asyncpg
+
+        conn = await asyncpg.connect(
+            self.dsn,
+            ssl=create_ssl_context() if settings.DATABASE_SSL else None,
+            server_settings={"application_name": "evang_tracker_api:invalidation"},
+        )
+        await conn.add_listener(self.channel, self._on_notify)
+        return conn
+
+    async def _run(self):
+        backoff = 1.0
+        first = True
+        while True:
+            try:
+                self._conn = await self._connect()
+                logger.info(f"Listening for invalidation events on {self.channel!r}")
+                if not first:
+                    await self.resync()
+                first = False
+                backoff = 1.0
+                # An idle socket can die silently; a cheap query notices it
+                while not self._conn.is_closed():
+                    await asyncio.sleep(self.healthcheck_seconds)
+                    await asyncio.wait_for(self._conn.fetchval("SELECT 1"), timeout=10)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Invalidation listener connection lost: {e}")
+            finally:
+                if self._conn is not None:
+                    self._conn.terminate()
+                    self._conn = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def _listen_dsn() -> Optional[str]:
+    if not settings.INVALIDATION_BUS_ENABLED:
+        return None
+    url = settings.DATABASE_LISTEN_URL or settings.DATABASE_URL
+    if not url.startswith("postgresql"):
+        return None
+    if settings.DB_POOLER_MODE and not settings.DATABASE_LISTEN_URL:
+        # LISTEN needs a session-level connection, which transaction poolers don't provide
+        logger.warning("Invalidation bus disabled: set DATABASE_LISTEN_URL to a direct endpoint in pooler mode")
+        return None
+    return asyncpg_dsn(url)
+
+
+invalidation_bus = InvalidationBus(
+    _listen_dsn(),
+    settings.INVALIDATION_CHANNEL,
+    settings.INVALIDATION_HEALTHCHECK_SECONDS,
+)
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.websockets import WebSocket, WebSocketState
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import LIVE_BACKPRESSURE, LIVE_SUBSCRIBERS
+from app.core.unit_of_work import after_commit, before_commit
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+
+# Invalidation bus topic carrying change events
+TOPIC_LIVE_EVENTS = "live_events"
+
+EVENT_REPORT = "report"
+EVENT_PERSON = "person"
+OP_CREATED = "created"
+OP_UPDATED = "updated"
+OP_DELETED = "deleted"
+OP_BULK = "bulk"
+
+# Sent when events may have been lost; the client refetches what it shows
+RESYNC: Event = {"type": "resync"}
+
+# One NOTIFY payload is limited to 8000 bytes; bigger commits (sync uploads)
+# are summarised as one bulk event per type and owner
+MAX_EVENTS_PER_COMMIT = 20
+
+# session.info key for the events staged by a unit of work
+_EVENTS_KEY = "live_events"
+
+
+def _compact(events: List[Event]) -> List[Event]:
+    if len(events) <= MAX_EVENTS_PER_COMMIT:
+        return events
+    counts = Counter((event["type"], event["evangelist_id"]) for event in events)
+    if len(counts) > MAX_EVENTS_PER_COMMIT:
+        return [RESYNC]
+    return [
+        {"type": kind, "op": OP_BULK, "evangelist_id": owner, "count": count}
+        for (kind, owner), count in counts.items()
+    ]
+
+
+class Subscriber:
+    """One WebSocket client and the events queued for it."""
+
+    def __init__(self, user: User, queue_size: int):
+        self.user_id = str(user.id)
+        self.admin = user.role == UserRole.admin
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        # Set while a resync is queued; events before it are moot
+        self.lagging = False
+
+    def sees(self, event: Event) -> bool:
+        """Admins see every change, evangelists changes to their own reports."""
+        owner = event.get("evangelist_id")
+        return self.admin or owner is None or owner == self.user_id
+
+    def offer(self, event: Event) -> None:
+        if self.lagging:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event: drop the backlog and
+            # have the client refetch instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.lagging = True
+            LIVE_BACKPRESSURE.labels("resync").inc()
+
+    def take(self, first: Event) -> List[Event]:
+        """first and whatever else is queued, emptying the queue."""
+        batch = [first]
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        self.lagging = False
+        return batch
+
+
+class EventBackend(ABC):
+    """Carries change events from the worker that wrote to the other workers."""
+
+    # Whether events reach subscribers of other workers
+    shared = False
+
+    @abstractmethod
+    async def publish(self, session: AsyncSession, events: List[Event]) -> None:
+        """Send events with the session's transaction."""
+        ...
+
+
+class InProcessBackend(EventBackend):
+    """The default: events only reach subscribers of the worker that wrote them."""
+
+    async def publish(self, session: AsyncSession, events: List[Event]) -> None:
+        return
+
+
+class PostgresBackend(EventBackend):
+    """
+    Fan-out to every worker over the invalidation bus (LISTEN/NOTIFY), so
+    events are only delivered when the write commits. The bus skips events
+    from its own worker; those are delivered locally after commit.
+    """
+
+    shared = True
+
+    def __init__(self, hub: "LiveEventHub"):
+        if not invalidation_bus.enabled:
+            logger.warning("LIVE_EVENTS_BACKEND=postgres needs the invalidation bus; events stay in-process")
+        invalidation_bus.subscribe(TOPIC_LIVE_EVENTS, self._on_events)
+        invalidation_bus.on_resync(self._on_resync)
+        self.hub = hub
+
+    async def publish(self, session: AsyncSession, events: List[Event]) -> None:
+        await invalidation_bus.publish(session, TOPIC_LIVE_EVENTS, events=events)
+
+    async def _on_events(self, data: dict) -> None:
+        self.hub.deliver(data.get("events", []))
+
+    async def _on_resync(self) -> None:
+        # Notifications sent while the listener was reconnecting are gone
+        self.hub.deliver([RESYNC])
+
+
+class LiveEventHub:
+    """
+    Change events for live dashboards.
+
+    Services stage an event per write with emit(); it is published with the
+    transaction and handed to the subscribers of this worker once it
+    commits, filtered by each subscriber's role. Every subscriber has a
+    bounded queue: a client that falls more than queue_size events behind
+    gets a single resync event instead of its backlog, and one whose socket
+    takes nothing for send_timeout seconds is disconnected.
+    """
+
+    def __init__(self, backend_name: str, queue_size: int, send_timeout: float, max_subscribers: int):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.max_subscribers = max_subscribers
+        self.subscribers: Set[Subscriber] = set()
+        self.backend: Optional[EventBackend] = None
+        if backend_name == "postgres":
+            self.backend = PostgresBackend(self)
+        elif backend_name == "memory":
+            self.backend = InProcessBackend()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def emit(self, session: AsyncSession, event: Event) -> None:
+        """Stage event in the session; it is delivered if and when the session commits."""
+        # Nobody can receive it: don't even stage it
+        if not self.enabled or not (self.subscribers or self.backend.shared):
+            return
+        events = session.info.get(_EVENTS_KEY)
+        if events is None:
+            events = session.info[_EVENTS_KEY] = []
+
+            async def publish() -> None:
+                events[:] = _compact(events)
+                await self.backend.publish(session, events)
+
+            before_commit(session, publish)
+            after_commit(session, lambda: self.deliver(events))
+        events.append(event)
+
+    def deliver(self, events: List[Event]) -> None:
+        """Queue events for the subscribers of this worker that may see them."""
+        for subscriber in self.subscribers:
+            for event in events:
+                if subscriber.sees(event):
+                    subscriber.offer(event)
+
+    def subscribe(self, user: User) -> Optional[Subscriber]:
+        """A new subscriber for user, or None when this worker has no room for one."""
+        if len(self.subscribers) >= self.max_subscribers:
+            LIVE_BACKPRESSURE.labels("refused").inc()
+            return None
+        subscriber = Subscriber(user, self.queue_size)
+        self.subscribers.add(subscriber)
+        LIVE_SUBSCRIBERS.inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self.subscribers:
+            self.subscribers.discard(subscriber)
+            LIVE_SUBSCRIBERS.dec()
+
+    async def stream(self, websocket: WebSocket, subscriber: Subscriber, lifetime: Optional[float] = None) -> None:
+        """
+        Send subscriber's events to an accepted websocket until the client
+        leaves, its socket stalls or lifetime seconds (the token's) run out.
+        Events queued while a send was in progress go out together as one
+        JSON array.
+        """
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        expired = asyncio.create_task(asyncio.sleep(lifetime)) if lifetime is not None else None
+        ends = {disconnected, expired} - {None}
+        try:
+            while True:
+                next_event = asyncio.create_task(subscriber.queue.get())
+                done, _ = await asyncio.wait({next_event, *ends}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    if expired in done:
+                        await _close(websocket, status.WS_1008_POLICY_VIOLATION, "Token expired")
+                    return
+                batch = subscriber.take(next_event.result())
+                try:
+                    await asyncio.wait_for(
+                        websocket.send_text(json.dumps(batch, separators=(",", ":"))),
+                        self.send_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    LIVE_BACKPRESSURE.labels("disconnect").inc()
+                    logger.info(f"Disconnecting live event subscriber {subscriber.user_id}: socket stalled")
+                    await _close(websocket, status.WS_1013_TRY_AGAIN_LATER, "Too slow")
+                    return
+        finally:
+            for task in ends:
+                task.cancel()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Nothing is expected from the client; this only notices it leaving
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+    except Exception:
+        return
+
+
+async def _close(websocket: WebSocket, code: int, reason: str) -> None:
+    if websocket.application_state != WebSocketState.CONNECTED:
+        return
+    try:
+        await asyncio.wait_for(websocket.close(code, reason), timeout=1.0)
+    except Exception:
+        pass
+
+
+def report_event(op: str, report) -> Event:
+    event = {"type": EVENT_REPORT, "op": op, "id": str(report.id), "evangelist_id": str(report.evangelist_id)}
+    if op != OP_DELETED:
+        event["updated_at"] = report.updated_at.isoformat()
+    return event
+
+
+def person_event(op: str, person, evangelist_id) -> Event:
+    event = {
+        "type": EVENT_PERSON,
+        "op": op,
+        "id": str(person.id),
+        "report_id": str(person.report_id),
+        "evangelist_id": str(evangelist_id),
+    }
+    if op != OP_DELETED:
+        event["updated_at"] = person.updated_at.isoformat()
+    return event
+
+
+def person_moved_event(person, previous_report) -> Event:
+    """For the owner of the report a person moved out of, the person is gone."""
+    event = person_event(OP_DELETED, person, previous_report.evangelist_id)
+    event["report_id"] = str(previous_report.id)
+    return event
+
+
+live_events = LiveEventHub(
+    settings.LIVE_EVENTS_BACKEND,
+    settings.LIVE_EVENTS_QUEUE_SIZE,
+    settings.LIVE_EVENTS_SEND_TIMEOUT_SECONDS,
+    settings.LIVE_EVENTS_MAX_SUBSCRIBERS,
+)
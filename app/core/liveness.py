@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+def install_idle_ping(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Ping pooled connections on checkout only if they sat idle for idle_seconds.
+
+    Recently used connections are handed out without a round-trip. A failed
+    ping raises DisconnectionError, which makes the pool discard the dead
+    connection and transparently retry the checkout with a fresh one.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used")
+        if last_used is not None and time.monotonic() - last_used < idle_seconds:
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            logger.warning(f"Idle connection failed liveness ping, reconnecting: {e}")
+            raise exc.DisconnectionError("Idle connection failed liveness ping") from e
+
+
+class ComputeKeepalive:
+    """
+    Run a trivial query every `interval` seconds between start_hour and
+    end_hour (UTC) so Neon does not suspend the compute during business hours.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: int, start_hour: int, end_hour: int):
+        self.engine = engine
+        self.interval = interval
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and self.engine.dialect.name == "postgresql"
+
+    def in_business_hours(self, now: Optional[datetime] = None) -> bool:
+        hour = (now or datetime.now(timezone.utc)).hour
+        if self.start_hour <= self.end_hour:
+            return self.start_hour <= hour < self.end_hour
+        # Window wraps past midnight, e.g. 20 -> 4
+        return hour >= self.start_hour or hour < self.end_hour
+
+    async def ping(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"Keepalive query failed: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.in_business_hours():
+                await self.ping()
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import time
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import pool_metrics
+from app.core.config import settings
+from app.core.request_timing import statement_hook
+
+# Set by the process manager before workers start (and before this import);
+# each worker then writes its samples to mmap files in that directory
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+    ["engine"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["engine"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Overflow connections currently open", ["engine"], multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+    buckets=pool_metrics.WAIT_BUCKETS,
+)
+BCRYPT_QUEUE = Histogram(
+    "bcrypt_queue_seconds",
+    "Time a bcrypt job waited for an executor thread",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "bcrypt hashing time",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time a request waited for an admission slot",
+    ["route_class"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests shed by admission control",
+    ["route_class", "reason"],
+)
+CLIENT_DISCONNECTS = Counter(
+    "http_client_disconnects_total",
+    "Requests cancelled because the client disconnected first",
+    ["route"],
+)
+DB_RETRIES = Counter(
+    "db_retries_total",
+    "Requests re-run after a transient database error",
+    ["route", "reason"],
+)
+DB_RETRY_FAILURES = Counter(
+    "db_retry_failures_total",
+    "Requests answered 503 after a transient database error they could not retry past",
+    ["route", "reason"],
+)
+IDEMPOTENT_REPLAYS = Counter(
+    "idempotent_replays_total",
+    "Requests answered with the stored response of an earlier request with the same Idempotency-Key",
+    ["route"],
+)
+LIVE_SUBSCRIBERS = Gauge(
+    "live_event_subscribers",
+    "WebSocket clients subscribed to live change events",
+    multiprocess_mode="livesum",
+)
+LIVE_BACKPRESSURE = Counter(
+    "live_event_backpressure_total",
+    "Live event subscribers refused, told to resync or disconnected to keep up",
+    ["action"],
+)
+EMAIL_SENDS = Counter("email_send_total", "Outgoing email attempts by outcome", ["outcome"])
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so ids don't explode label cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Record request latency and in-flight requests for every HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_LATENCY.labels(scope["method"], route_template(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
+
+
+def install_engine_metrics(engine: AsyncEngine, metrics: pool_metrics.PoolMetrics) -> None:
+    """Observe statement latency and pool checkout waits for engine."""
+    latency = DB_QUERY_LATENCY.labels(metrics.name)
+    metrics.wait_observers.append(DB_POOL_WAIT.labels(metrics.name).observe)
+
+    statement_hook(engine).subscribe(lambda timed: latency.observe(timed.elapsed))
+
+
+def _pool_number(pool, method: str) -> Optional[float]:
+    fn = getattr(pool, method, None)
+    try:
+        return float(fn()) if callable(fn) else None
+    except Exception:
+        return None
+
+
+def refresh_pool_gauges() -> None:
+    """Copy this worker's pool state from pool_metrics into the pool gauges."""
+    for name, metrics in pool_metrics.registry.items():
+        pool = metrics.engine.pool if metrics.engine is not None else None
+        for gauge, method in (
+            (DB_POOL_SIZE, "size"),
+            (DB_POOL_CHECKED_OUT, "checkedout"),
+            (DB_POOL_OVERFLOW, "overflow"),
+        ):
+            value = _pool_number(pool, method)
+            if value is not None:
+                gauge.labels(name).set(max(value, 0.0))
+
+
+class PoolGaugeSampler:
+    """
+    Refresh pool gauges every `interval` seconds. Only needed in multiprocess
+    mode, where a scrape is served by one worker but must see every pool.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            refresh_pool_gauges()
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if not MULTIPROCESS or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(os.getpid())
+
+
+pool_sampler = PoolGaugeSampler(settings.METRICS_POOL_SAMPLE_SECONDS)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return the Prometheus text exposition for this process or, in multiprocess mode, all workers."""
+    refresh_pool_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,163 @@
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Weight of the newest sample in the moving average of connection hold time
+HOLD_EWMA_ALPHA = 0.1
+
+
+class PoolMetrics:
+    """Counters and checkout wait-time histogram for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        # Checkouts currently blocked waiting for a connection
+        self.waiting = 0
+        # Moving average of how long a connection stays checked out
+        self.hold_avg = 0.0
+        # Extra sinks for wait times, e.g. the Prometheus histogram
+        self.wait_observers: List[Callable[[float], None]] = []
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_sum += seconds
+        if seconds > self.wait_max:
+            self.wait_max = seconds
+        self.wait_buckets[bisect_left(WAIT_BUCKETS, seconds)] += 1
+        for observe in self.wait_observers:
+            observe(seconds)
+
+    def observe_hold(self, seconds: float) -> None:
+        if self.hold_avg == 0.0:
+            self.hold_avg = seconds
+        else:
+            self.hold_avg += HOLD_EWMA_ALPHA * (seconds - self.hold_avg)
+
+    def estimated_wait(self) -> float:
+        """
+        Rough wait for a new checkout: zero while the pool has a free slot,
+        otherwise the checkouts queued ahead times the average hold time,
+        spread over every connection the pool may open.
+        """
+        pool = self.engine.pool if self.engine is not None else None
+        size = _call(pool, "size")
+        max_overflow = getattr(pool, "_max_overflow", None)
+        if size is None or max_overflow is None or max_overflow < 0:
+            return 0.0
+        capacity = size + max_overflow
+        if capacity <= 0 or pool.checkedout() < capacity:
+            return 0.0
+        return (self.waiting + 1) * self.hold_avg / capacity
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.engine.pool if self.engine is not None else None
+        histogram = {
+            f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)
+        }
+        histogram["le_inf"] = self.wait_buckets[-1]
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__ if pool is not None else None,
+            "size": _call(pool, "size"),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "timeout": _call(pool, "timeout"),
+            "checked_in": _call(pool, "checkedin"),
+            "checked_out": _call(pool, "checkedout"),
+            "overflow": _call(pool, "overflow"),
+            "connections_opened": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "hold_avg_seconds": round(self.hold_avg, 6),
+            "estimated_wait_seconds": round(self.estimated_wait(), 6),
+            "checkout_wait": {
+                "count": self.wait_count,
+                "sum_seconds": round(self.wait_sum, 6),
+                "max_seconds": round(self.wait_max, 6),
+                "histogram": histogram,
+            },
+        }
+
+
+def _call(pool: Optional[Pool], method: str):
+    fn = getattr(pool, method, None)
+    return fn() if fn is not None else None
+
+
+# Metrics of every engine built in this process, keyed by engine name
+registry: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(metrics: PoolMetrics) -> Type[AsyncAdaptedQueuePool]:
+    """
+    Return a queue pool class that times how long checkouts wait for a connection.
+
+    SQLAlchemy has no pool event that fires before a checkout starts waiting,
+    so the wait is measured around _do_get. The class carries its metrics so
+    they survive pool recreation on engine.dispose().
+    """
+
+    class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+        _metrics = metrics
+
+        def _do_get(self):
+            start = time.perf_counter()
+            self._metrics.waiting += 1
+            try:
+                conn = super()._do_get()
+            except exc.TimeoutError:
+                self._metrics.timeouts += 1
+                raise
+            finally:
+                self._metrics.waiting -= 1
+            self._metrics.observe_wait(time.perf_counter() - start)
+            return conn
+
+    return InstrumentedAsyncAdaptedQueuePool
+
+
+def install_pool_listeners(engine: AsyncEngine, metrics: PoolMetrics) -> None:
+    """Attach pool event listeners that feed the metrics of an engine."""
+    sync_engine = engine.sync_engine
+    metrics.engine = sync_engine
+    registry[metrics.name] = metrics
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe_hold(time.perf_counter() - checked_out_at)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
@@ -0,0 +1,165 @@
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Allocation frames that belong to the profiler itself
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryProfiler:
+    """
+    tracemalloc wrapper: start() takes a baseline snapshot and diff() reports
+    which lines (or files) allocated the most since then. tracemalloc is only
+    running between start() and stop().
+    """
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self.started_at = time.time()
+        self._baseline = self._snapshot()
+        return self.status()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._baseline = None
+        self.started_at = None
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.running else (0, 0)
+        return {
+            "tracing": self.running,
+            "frames": tracemalloc.get_traceback_limit() if self.running else None,
+            "started_at": self.started_at,
+            "traced_current_kb": round(current / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "rss_kb": (current_rss_bytes() or 0) // 1024,
+        }
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+
+    def diff(self, limit: int = 25, group_by: str = "lineno", reset: bool = False) -> List[Dict[str, Any]]:
+        """Top allocation changes since the baseline, largest growth first."""
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._baseline, group_by)
+        if reset:
+            self._baseline = snapshot
+        result = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            entry = {
+                "file": frame.filename,
+                "line": frame.lineno if group_by != "filename" else None,
+                "size_kb": round(stat.size / 1024, 1),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            if group_by == "traceback":
+                entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+            result.append(entry)
+        return result
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float) -> Counter:
+    """
+    Sample the stack of one thread every `interval` seconds for `seconds`,
+    returning collapsed stacks ("outer;...;inner") with their sample counts.
+    Runs in its own thread; the sampled thread is never paused.
+    """
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+class CpuProfiler:
+    """One CPU profile at a time on the event-loop thread of this worker."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def sample(self, seconds: float, interval: float = 0.005) -> str:
+        """Sampling profile in collapsed-stack format (flamegraph.pl, speedscope)."""
+        async with self._lock:
+            loop_thread = threading.get_ident()
+            stacks = await asyncio.to_thread(sample_stacks, loop_thread, seconds, interval)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    async def cprofile(self, seconds: float) -> pstats.Stats:
+        """Deterministic profile of everything the event loop runs for `seconds`."""
+        async with self._lock:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+        return pstats.Stats(profile)
+
+    @staticmethod
+    def pstats_text(stats: pstats.Stats, limit: int = 60) -> str:
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return out.getvalue()
+
+    @staticmethod
+    def pstats_dump(stats: pstats.Stats) -> bytes:
+        """Binary dump loadable with pstats.Stats(path) or snakeviz."""
+        return marshal.dumps(stats.stats)
+
+
+memory_profiler = MemoryProfiler()
+cpu_profiler = CpuProfiler()
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import os
+import random
+import signal
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiling import current_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# Set by app.server for the worker processes it supervises; a worker that
+# exits there is replaced, while a standalone server would just stop
+SUPERVISED_ENV = "EVANG_SUPERVISED"
+
+
+class WorkerRecycler:
+    """
+    Gracefully restart this worker once it has served max_requests (plus a
+    per-worker random jitter, so workers don't all restart together) or its
+    RSS exceeds max_rss_mb. The worker sends itself SIGTERM, finishes its
+    in-flight requests, and the supervisor starts a fresh one.
+    """
+
+    def __init__(self, max_requests: int, jitter: int, max_rss_mb: int, check_interval: float):
+        self.max_requests = max_requests + random.randint(0, max(0, jitter)) if max_requests > 0 else 0
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.check_interval = check_interval
+        self.requests = 0
+        self.recycling = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return os.environ.get(SUPERVISED_ENV) == "1" and (self.max_requests > 0 or self.max_rss_bytes > 0)
+
+    def count_request(self) -> None:
+        self.requests += 1
+        if self.max_requests and self.requests >= self.max_requests:
+            self.recycle(f"served {self.requests} requests")
+
+    def recycle(self, reason: str) -> None:
+        if self.recycling:
+            return
+        self.recycling = True
+        logger.warning(f"Recycling worker {os.getpid()}: {reason}")
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    async def _run(self):
+        while not self.recycling:
+            await asyncio.sleep(self.check_interval)
+            rss = current_rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                self.recycle(f"RSS {rss // (1024 * 1024)} MB over {self.max_rss_bytes // (1024 * 1024)} MB")
+
+    async def start(self):
+        if not self.enabled or not self.max_rss_bytes or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+class RequestCountMiddleware:
+    """Feed the request count of this worker to the recycler."""
+
+    def __init__(self, app: ASGIApp, recycler: WorkerRecycler):
+        self.app = app
+        self.recycler = recycler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if scope["type"] == "http":
+                self.recycler.count_request()
+
+
+recycler = WorkerRecycler(
+    settings.WORKER_MAX_REQUESTS,
+    settings.WORKER_MAX_REQUESTS_JITTER,
+    settings.WORKER_MAX_RSS_MB,
+    settings.WORKER_RSS_CHECK_SECONDS,
+)
@@ -0,0 +1,194 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestTimings:
+    """Per-request counters; times are perf_counter seconds."""
+
+    start: float = field(default_factory=time.perf_counter)
+    db_count: int = 0
+    db_time: float = 0.0
+    db_commits: int = 0
+    auth_time: float = 0.0
+
+    def server_timing(self) -> str:
+        total = time.perf_counter() - self.start
+        app_time = max(0.0, total - self.db_time - self.auth_time)
+        return ", ".join([
+            f'db-count;desc="{self.db_count}"',
+            f"db-time;dur={self.db_time * 1000:.1f}",
+            f'db-commits;desc="{self.db_commits}"',
+            f"auth-time;dur={self.auth_time * 1000:.1f}",
+            f"app-time;dur={app_time * 1000:.1f}",
+        ])
+
+
+# None outside a timed request, so disabled instrumentation costs one lookup
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@dataclass
+class TimedStatement:
+    """A statement seen by a StatementHook; context is scratch space for subscribers."""
+
+    statement: str
+    parameters: Any
+    start: float
+    elapsed: float = 0.0
+    error: Optional[BaseException] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+StatementCallback = Callable[[TimedStatement], None]
+
+
+class StatementHook:
+    """
+    One set of cursor listeners per engine that times every statement once
+    and hands it to the subscribers (server timing, metrics, slow query log,
+    tracing). after() also runs for failed statements, with error set.
+    """
+
+    def __init__(self):
+        self._before: List[StatementCallback] = []
+        self._after: List[StatementCallback] = []
+
+    def subscribe(self, after: StatementCallback, before: Optional[StatementCallback] = None) -> None:
+        self._after.append(after)
+        if before is not None:
+            self._before.append(before)
+
+    def install(self, sync_engine) -> None:
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            timed = TimedStatement(statement, parameters, time.perf_counter())
+            for callback in self._before:
+                callback(timed)
+            conn.info.setdefault("timed_statements", []).append(timed)
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            self._finish(conn.info["timed_statements"].pop())
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _on_error(exception_context):
+            # after_cursor_execute does not fire for failed statements
+            if exception_context.connection is None or exception_context.statement is None:
+                return
+            stack = exception_context.connection.info.get("timed_statements")
+            if stack:
+                timed = stack.pop()
+                timed.error = exception_context.original_exception
+                self._finish(timed)
+
+    def _finish(self, timed: TimedStatement) -> None:
+        timed.elapsed = time.perf_counter() - timed.start
+        for callback in self._after:
+            callback(timed)
+
+
+_hooks: "weakref.WeakKeyDictionary[Any, StatementHook]" = weakref.WeakKeyDictionary()
+
+
+def statement_hook(engine: AsyncEngine) -> StatementHook:
+    """The engine's StatementHook, installed on first use."""
+    sync_engine = engine.sync_engine
+    hook = _hooks.get(sync_engine)
+    if hook is None:
+        hook = _hooks[sync_engine] = StatementHook()
+        hook.install(sync_engine)
+    return hook
+
+
+def install_query_timing(engine: AsyncEngine) -> None:
+    """Count and time every statement and commit run on engine against the current request."""
+
+    def _count(timed: TimedStatement) -> None:
+        timings = _current.get()
+        if timings is not None:
+            timings.db_count += 1
+            timings.db_time += timed.elapsed
+
+    statement_hook(engine).subscribe(_count)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _on_commit(conn):
+        timings = _current.get()
+        if timings is not None:
+            timings.db_commits += 1
+
+
+def add_auth_time(seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.auth_time += seconds
+
+
+def timed_auth(fn):
+    """Attribute the wrapped (synchronous) security function's run time to auth-time."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return fn(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings.auth_time += time.perf_counter() - started
+
+    return wrapper
+
+
+class ServerTimingMiddleware:
+    """
+    Collect per-request DB and auth timings and report them in a Server-Timing
+    header. With query_log_threshold > 0, requests running more queries than
+    that are logged, which is how N+1 regressions show up.
+    """
+
+    def __init__(self, app: ASGIApp, query_log_threshold: int = 0):
+        self.app = app
+        self.query_log_threshold = query_log_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.query_log_threshold and timings.db_count > self.query_log_threshold:
+                logger.warning(
+                    f"{scope['method']} {scope['path']} ran {timings.db_count} queries "
+                    f"({timings.db_time * 1000:.1f} ms in the database)"
+                )
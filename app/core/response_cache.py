@@ -0,0 +1,337 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models.user import User, UserRole
+from app.utils.conditional import is_not_modified
+
+logger = logging.getLogger(__name__)
+
+# Tags that writes invalidate
+CACHE_TAG_USERS = "users"
+CACHE_TAG_REPORTS = "reports"
+CACHE_TAG_PEOPLE = "people"
+
+# Invalidation bus topic carrying cache tags
+TOPIC_CACHE_TAGS = "cache_tags"
+
+# Headers that must not be replayed from a cached response
+_SKIP_HEADERS = {"content-length", "x-cache"}
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    headers: Dict[str, str]
+    media_type: str
+    tags: Tuple[str, ...]
+    fresh_until: float
+    stale_until: float
+
+    def dumps(self) -> bytes:
+        meta = {
+            "headers": self.headers,
+            "media_type": self.media_type,
+            "tags": self.tags,
+            "fresh_until": self.fresh_until,
+            "stale_until": self.stale_until,
+        }
+        return json.dumps(meta).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CacheEntry":
+        meta, body = raw.split(b"\n", 1)
+        data = json.loads(meta)
+        return cls(
+            body=body,
+            headers=data["headers"],
+            media_type=data["media_type"],
+            tags=tuple(data["tags"]),
+            fresh_until=data["fresh_until"],
+            stale_until=data["stale_until"],
+        )
+
+
+class CacheBackend(ABC):
+    """Storage for cache entries. Times in entries are wall-clock seconds."""
+
+    # Shared backends are invalidated once by the writer, not by every worker
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryLRUBackend(CacheBackend):
+    """Per-process LRU; the default backend."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= time.time():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._discard(key)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, set()):
+                self._discard(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared store speaking the Redis protocol (Redis, Valkey, or a local stand-in).
+    Requires the optional `redis` package.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "evang:cache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the 'redis' package"
+            ) from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raw = await self.client.get(self.prefix + key)
+        return CacheEntry.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ttl = max(1, math.ceil(entry.stale_until - time.time()))
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, entry.dumps(), ex=ttl)
+            for tag in entry.tags:
+                pipe.sadd(self._tag_key(tag), self.prefix + key)
+                pipe.expire(self._tag_key(tag), ttl)
+            await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            keys = await self.client.smembers(self._tag_key(tag))
+            await self.client.delete(self._tag_key(tag), *keys)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            await self.client.delete(key)
+
+
+def cache_scope(user: User) -> str:
+    """All admins share one view; evangelists only ever see their own rows."""
+    if user.role == UserRole.admin:
+        return "admin"
+    return f"user:{user.id}"
+
+
+class ResponseCache:
+    """
+    Cache of rendered GET responses keyed by (route, query params, role scope).
+
+    Fresh entries are served directly. Once stale, the first request refreshes
+    the entry while concurrent requests keep getting the stale copy, and on a
+    cold miss concurrent requests wait for the single in-flight computation,
+    so a burst never turns into a burst of identical queries.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float, stale_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so a computation that raced a write is not stored
+        self._generations: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def key(request: Request, scope: str) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}|{scope}"
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        if not self.enabled:
+            return
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        try:
+            await self.backend.invalidate_tags(tags)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed for {tags}: {e}")
+
+    async def clear(self) -> None:
+        if not self.enabled:
+            return
+        for tag in list(self._generations):
+            self._generations[tag] += 1
+        await self.backend.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        scope: str,
+        tags: Tuple[str, ...],
+        producer: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Serve the response for this request from cache, computing it at most once."""
+        if not self.enabled:
+            return await producer()
+
+        key = self.key(request, scope)
+        entry, state, response = await self._lookup(key, tags, producer)
+        if entry is None:
+            # Not cacheable (error status or backend failure); hand back the original
+            return response
+
+        etag = entry.headers.get("etag")
+        if etag is not None and is_not_modified(request, etag, None):
+            headers = {k: v for k, v in entry.headers.items() if k.lower() in ("etag", "last-modified", "cache-control")}
+            headers["X-Cache"] = state
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(
+            content=entry.body,
+            headers={**entry.headers, "X-Cache": state},
+            media_type=entry.media_type,
+        )
+
+    async def _lookup(self, key, tags, producer):
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            entry = None
+
+        now = time.time()
+        if entry is not None:
+            if now < entry.fresh_until:
+                return entry, "HIT", None
+            if key in self._inflight:
+                return entry, "STALE", None
+        elif key in self._inflight:
+            shared = await asyncio.shield(self._inflight[key])
+            if shared is not None:
+                return shared, "HIT", None
+
+        return await self._compute(key, tags, producer, "REFRESH" if entry is not None else "MISS")
+
+    async def _compute(self, key, tags, producer, state):
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generations = tuple(self._generations.get(tag, 0) for tag in tags)
+        entry = None
+        try:
+            response = await producer()
+            if response.status_code == status.HTTP_200_OK:
+                now = time.time()
+                entry = CacheEntry(
+                    body=bytes(response.body),
+                    headers={
+                        k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS
+                    },
+                    media_type=response.media_type or "application/json",
+                    tags=tags,
+                    fresh_until=now + self.ttl,
+                    stale_until=now + self.ttl + self.stale_ttl,
+                )
+                if generations == tuple(self._generations.get(tag, 0) for tag in tags):
+                    try:
+                        await self.backend.set(key, entry)
+                    except Exception as e:
+                        logger.warning(f"Response cache write failed: {e}")
+            return entry, state, response
+        finally:
+            # Waiters recompute themselves if this attempt failed
+            future.set_result(entry)
+            self._inflight.pop(key, None)
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return None
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if not settings.RESPONSE_CACHE_URL:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+        return RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+    return InMemoryLRUBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(
+    _build_backend(),
+    settings.RESPONSE_CACHE_TTL,
+    settings.RESPONSE_CACHE_STALE_TTL,
+)
+
+
+async def _on_cache_tags(data: dict) -> None:
+    if response_cache.enabled and not response_cache.backend.shared:
+        await response_cache.invalidate_tags(*data.get("tags", []))
+
+
+async def _on_resync() -> None:
+    if response_cache.enabled and not response_cache.backend.shared:
+        await response_cache.clear()
+
+
+invalidation_bus.subscribe(TOPIC_CACHE_TAGS, _on_cache_tags)
+invalidation_bus.on_resync(_on_resync)
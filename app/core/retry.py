@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import DB_RETRIES, DB_RETRY_FAILURES, route_template
+
+logger = logging.getLogger(__name__)
+
+# Reads run again freely; other methods only when the client sent an idempotency key
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+
+# Retry reasons
+REASON_CONNECTION = "connection"
+REASON_UNAVAILABLE = "unavailable"
+REASON_SERIALIZATION = "serialization"
+REASON_STALE_STATEMENT = "stale_statement"
+
+# Postgres rolled the transaction back before anything was committed, so
+# these are retried for every method
+ROLLED_BACK_REASONS = {REASON_SERIALIZATION, REASON_STALE_STATEMENT}
+
+RETRYABLE_SQLSTATES = {
+    "40001": REASON_SERIALIZATION,  # serialization_failure
+    "40P01": REASON_SERIALIZATION,  # deadlock_detected
+    "57P01": REASON_UNAVAILABLE,  # admin_shutdown, e.g. Neon suspending the compute
+    "57P02": REASON_UNAVAILABLE,  # crash_shutdown
+    "57P03": REASON_UNAVAILABLE,  # cannot_connect_now, compute still starting
+    "53300": REASON_UNAVAILABLE,  # too_many_connections
+}
+# Class 08: connection exceptions
+CONNECTION_SQLSTATE_CLASS = "08"
+
+# asyncpg errors without a SQLSTATE, matched by name so asyncpg is not imported here
+CONNECTION_ERROR_NAMES = {
+    "ConnectionDoesNotExistError",
+    "ConnectionFailureError",
+    "InternalClientError",
+}
+STALE_STATEMENT_ERROR_NAMES = {
+    "InvalidCachedStatementError",
+    "OutdatedSchemaCacheError",
+}
+
+
+# Modules on the path that opens a new database connection
+CONNECT_PATH_MODULES = ("sqlalchemy.pool", "asyncpg.connect_utils")
+
+
+def _error_chain(exc: BaseException) -> List[BaseException]:
+    """exc, the DBAPI error SQLAlchemy wrapped and the driver errors it was raised from."""
+    chain = []
+    seen = set()
+    pending = [exc]
+    while pending:
+        error = pending.pop(0)
+        if error is None or id(error) in seen:
+            continue
+        seen.add(id(error))
+        chain.append(error)
+        pending.extend([getattr(error, "orig", None), error.__cause__])
+    return chain
+
+
+def _raised_connecting(exc: BaseException) -> bool:
+    """Whether exc was raised while the pool was opening a database connection."""
+    tb = exc.__traceback__
+    while tb is not None:
+        if tb.tb_frame.f_globals.get("__name__", "").startswith(CONNECT_PATH_MODULES):
+            return True
+        tb = tb.tb_next
+    return False
+
+
+def classify(exc: BaseException) -> Optional[str]:
+    """Return the retry reason for a transient database error, or None when it is fatal."""
+    if isinstance(exc, PoolTimeoutError):
+        # The pool is exhausted; another attempt only adds to the queue
+        return None
+    chain = _error_chain(exc)
+    for error in chain:
+        name = type(error).__name__
+        if name in STALE_STATEMENT_ERROR_NAMES:
+            return REASON_STALE_STATEMENT
+        sqlstate = getattr(error, "sqlstate", None)
+        if sqlstate:
+            if sqlstate in RETRYABLE_SQLSTATES:
+                return RETRYABLE_SQLSTATES[sqlstate]
+            if sqlstate.startswith(CONNECTION_SQLSTATE_CLASS):
+                return REASON_CONNECTION
+            # Any other server error, statement timeouts included, is fatal
+            return None
+    # Socket errors only count when they came from the database: wrapped by
+    # SQLAlchemy, or raised while connecting. A Redis or SMTP failure is not
+    # a reason to re-run the request.
+    if not (isinstance(exc, DBAPIError) or _raised_connecting(exc)):
+        return None
+    for error in chain:
+        if getattr(error, "connection_invalidated", False):
+            return REASON_CONNECTION
+        if type(error).__name__ in CONNECTION_ERROR_NAMES:
+            return REASON_CONNECTION
+        # Connection refused or reset, DNS failures and connect timeouts
+        if isinstance(error, OSError):
+            return REASON_CONNECTION
+    return None
+
+
+class _Attempt:
+    committed = False
+
+
+_current_attempt: ContextVar[Optional[_Attempt]] = ContextVar("db_retry_attempt", default=None)
+
+
+def mark_committed() -> None:
+    """Called once a transaction commits; a request that committed is never re-run."""
+    attempt = _current_attempt.get()
+    if attempt is not None:
+        attempt.committed = True
+
+
+class RetryPolicy:
+    """
+    Attempts and backoff for re-running a request after a transient error.
+
+    Delays grow exponentially with full jitter, so workers that failed at
+    the same moment (a Neon compute waking up, a dropped pooler) do not
+    come back in lockstep. A request stops retrying after max_attempts or
+    once the next delay would take it past its time budget.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float, budget: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before attempt + 1, for the attempt (1-based) that just failed."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.max_delay))
+
+
+def _wants_retry(scope: Scope) -> bool:
+    if scope["method"] in IDEMPOTENT_METHODS:
+        return True
+    return any(name == IDEMPOTENCY_KEY_HEADER for name, _ in scope["headers"])
+
+
+async def _read_body(receive: Receive) -> List[Message]:
+    messages = []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            return messages
+
+
+async def _recover(reason: str) -> None:
+    if reason == REASON_STALE_STATEMENT:
+        from app.core.database import reset_statement_caches
+        from app.core.schema_version import schema_watcher
+
+        # Pooled connections stay open and re-prepare their statements
+        reset_statement_caches()
+        await schema_watcher.check()
+
+
+class RetryMiddleware:
+    """
+    Re-run a request whose transaction failed with a transient database error.
+
+    With one commit per request (see app.core.unit_of_work) the request is
+    the transaction, so the whole request is replayed, body included, as
+    long as no response has started and nothing was committed. Reads are
+    retried; writes only with an Idempotency-Key header, because a
+    connection lost during COMMIT leaves the outcome unknown. Errors where
+    Postgres already rolled back (serialization failures, deadlocks, stale
+    prepared statements) are retried for every method. A request that runs
+    out of attempts or time gets 503 with Retry-After instead of a 500.
+    """
+
+    def __init__(self, app: ASGIApp, policy: RetryPolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.policy.max_attempts <= 1:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        retry_any = _wants_retry(scope)
+        deadline = time.monotonic() + self.policy.budget
+        number = 1
+
+        while True:
+            attempt = _Attempt()
+            response_started = False
+            replay = list(body)
+
+            async def replay_receive() -> Message:
+                if replay:
+                    return replay.pop(0)
+                return await receive()
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal response_started
+                if message["type"] == "http.response.start":
+                    response_started = True
+                await send(message)
+
+            token = _current_attempt.set(attempt)
+            try:
+                await self.app(scope, replay_receive, send_wrapper)
+                return
+            except Exception as exc:
+                reason = classify(exc)
+                if reason is None or response_started or attempt.committed:
+                    raise
+                error = exc
+            finally:
+                _current_attempt.reset(token)
+
+            route = route_template(scope)
+            delay = 0.0 if reason == REASON_STALE_STATEMENT else self.policy.backoff(number)
+            if (
+                not (retry_any or reason in ROLLED_BACK_REASONS)
+                or number >= self.policy.max_attempts
+                or time.monotonic() + delay > deadline
+            ):
+                DB_RETRY_FAILURES.labels(route, reason).inc()
+                logger.error(
+                    f"{scope['method']} {scope['path']} failed after {number} attempt(s), {reason}: {error}"
+                )
+                response = JSONResponse(
+                    {"detail": "Database temporarily unavailable, retry later"},
+                    status_code=503,
+                    headers={"Retry-After": str(self.policy.retry_after())},
+                )
+                await response(scope, receive, send)
+                return
+
+            DB_RETRIES.labels(route, reason).inc()
+            logger.warning(
+                f"{scope['method']} {scope['path']} attempt {number} failed, {reason}; "
+                f"retrying in {delay * 1000:.0f} ms: {error}"
+            )
+            await _recover(reason)
+            await asyncio.sleep(delay)
+            number += 1
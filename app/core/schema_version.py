@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import get_engine, reset_statement_caches
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaVersionWatcher:
+    """
+    Track the alembic revision this worker has seen.
+
+    A cheap periodic check reads alembic_version; when the revision moves,
+    the prepared statement caches of the pooled connections are reset
+    without closing the connections themselves.
+    """
+
+    def __init__(self, engine_factory: Callable[[], AsyncEngine], interval: int):
+        self.engine_factory = engine_factory
+        self.interval = interval
+        self.version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self.engine_factory()
+
+    @property
+    def enabled(self) -> bool:
+        # sqlite has no prepared statement cache to reset
+        return self.interval > 0 and self.engine.dialect.name == "postgresql"
+
+    async def fetch_version(self) -> Optional[str]:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            versions = sorted(result.scalars().all())
+        return ",".join(versions) or None
+
+    async def check(self) -> bool:
+        """Return True if the schema version changed since the last check."""
+        if not self.enabled:
+            return False
+        try:
+            version = await self.fetch_version()
+        except Exception as e:
+            logger.warning(f"Could not read alembic version: {e}")
+            return False
+
+        if self.version is None:
+            self.version = version
+            logger.info(f"Schema version: {version}")
+            return False
+
+        if version == self.version:
+            return False
+
+        logger.info(f"Schema version changed {self.version} -> {version}")
+        self.version = version
+        reset_statement_caches()
+        return True
+
+    async def _run(self):
+        # The first check records the current version without holding up startup
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+schema_watcher = SchemaVersionWatcher(get_engine, settings.SCHEMA_VERSION_CHECK_SECONDS)
@@ -1,8 +1,13 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional, Dict
-from jose import JWTError, jwt
 import uuid
 from .config import settings
+from .metrics import BCRYPT_DURATION, BCRYPT_QUEUE
+from .request_timing import add_auth_time, timed_auth
+from .tracing import tracer
 
 # Use bcrypt directly to avoid passlib/bcrypt version conflicts
 import bcrypt
@@ -32,12 +37,17 @@ _ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 _REFRESH_TOKEN_EXPIRE_DAYS = getattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", 7)
 
 
+@timed_auth
 def _create_token(
     subject: Union[str, Any],
     token_type: str,
     expires_delta: timedelta,
 ) -> str:
     """Internal helper for JWT creation."""
+    # jose (and the cryptography backend it loads) is imported on first use,
+    # keeping it off the startup path
+    from jose import jwt
+
     now = datetime.now(tz=timezone.utc)
     expire = now + expires_delta
     payload = {
@@ -66,8 +76,11 @@ def create_refresh_token(
     return _create_token(subject, TOKEN_TYPE_REFRESH, expires)
 
 
+@timed_auth
 def verify_token(token: str, token_type: str = TOKEN_TYPE_ACCESS) -> Optional[Dict[str, Any]]:
     """Verify JWT token and return payload."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
@@ -83,6 +96,7 @@ def verify_token(token: str, token_type: str = TOKEN_TYPE_ACCESS) -> Optional[Di
     return payload
 
 
+@timed_auth
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     if not plain_password or not hashed_password:
@@ -90,14 +104,53 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@timed_auth
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     if not password:
         raise ValueError("Password cannot be empty")
     return pwd_context.hash(password)
 
+# bcrypt releases the GIL, so hashing in threads keeps the event loop responsive
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+
+async def _run_bcrypt(operation: str, fn, *args):
+    """Run a bcrypt call on the executor, recording queue and hashing time."""
+    submitted = time.perf_counter()
+
+    with tracer.span(f"bcrypt {operation}") as span:
+
+        def job():
+            started = time.perf_counter()
+            BCRYPT_QUEUE.observe(started - submitted)
+            if span is not None:
+                span.attributes["bcrypt.queue_ms"] = round((started - submitted) * 1000, 3)
+            try:
+                return fn(*args)
+            finally:
+                BCRYPT_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, job)
+        finally:
+            add_auth_time(time.perf_counter() - submitted)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password without blocking the event loop."""
+    return await _run_bcrypt("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash without blocking the event loop."""
+    return await _run_bcrypt("hash", get_password_hash, password)
+
+
 def is_token_expired(token: str) -> bool:
     """Check if token is expired."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
@@ -115,6 +168,8 @@ def is_token_expired(token: str) -> bool:
 
 def get_token_remaining_time(token: str) -> Optional[int]:
     """Get remaining time in seconds for token."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_timing import TimedStatement, statement_hook
+
+logger = logging.getLogger(__name__)
+
+# ASGI scope of the request being served, to name the calling endpoint
+_request_scope: ContextVar[Optional[Scope]] = ContextVar("slow_query_scope", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists vary in length per call; collapse them so they group together
+_PARAM_LIST = re.compile(r"\(\s*(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+# Parameter types logged as-is; ids and dates are kept too, everything else is redacted
+_SAFE_TYPES = (bool, int, float, type(None))
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace, literals and parameter lists so equivalent statements group together."""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(...)", normalized)
+    return _NUMBER.sub("N", normalized)
+
+
+def redact_parameters(parameters: Any, limit: int = 20) -> Any:
+    """Keep ids, numbers and dates; replace strings and bytes with their type and length."""
+    def redact(value):
+        if isinstance(value, (UUID, date, Decimal)):
+            return str(value)
+        if isinstance(value, _SAFE_TYPES):
+            return value
+        if isinstance(value, (str, bytes)):
+            return f"<{type(value).__name__}:{len(value)}>"
+        return f"<{type(value).__name__}>"
+
+    if isinstance(parameters, dict):
+        return {k: redact(v) for k, v in list(parameters.items())[:limit]}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            # executemany: show the first row only
+            return [redact_parameters(parameters[0], limit), f"... {len(parameters)} rows"]
+        return [redact(v) for v in parameters[:limit]]
+    return redact(parameters)
+
+
+def current_endpoint() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "?")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class StatementStats:
+    __slots__ = ("statement", "count", "total", "max", "last_seen", "endpoint")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+        self.endpoint = ""
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "max_ms": round(self.max * 1000, 1),
+            "avg_ms": round(self.total / self.count * 1000, 1),
+            "total_ms": round(self.total * 1000, 1),
+            "last_endpoint": self.endpoint,
+            "last_seen": datetime.fromtimestamp(self.last_seen, timezone.utc).isoformat(),
+        }
+
+
+class SlowQueryLog:
+    """
+    Log statements slower than threshold_ms with redacted parameters and the
+    calling endpoint, and keep per-statement stats for the slowest ones.
+
+    A sample (explain_sample_rate) of slow SELECTs is EXPLAINed on a separate
+    pooled connection, at most once per statement per explain_cooldown
+    seconds, and the JSON plans are appended to a rotating plan file.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_sample_rate: float = 0.0,
+        plan_file: Optional[str] = None,
+        max_statements: int = 200,
+        explain_cooldown: float = 600.0,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.max_statements = max_statements
+        self.explain_cooldown = explain_cooldown
+        self._stats: Dict[str, StatementStats] = {}
+        self._explained: Dict[str, float] = {}
+        self._explain_lock = asyncio.Lock()
+        # EXPLAINs in flight; the loop only keeps weak references to tasks
+        self._explaining: Set[asyncio.Task] = set()
+        self._plan_logger: Optional[logging.Logger] = None
+        if plan_file and explain_sample_rate > 0:
+            self._plan_logger = self._build_plan_logger(plan_file)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    @staticmethod
+    def _build_plan_logger(path: str) -> logging.Logger:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        plan_logger = logging.getLogger(f"{__name__}.plans")
+        plan_logger.setLevel(logging.INFO)
+        plan_logger.propagate = False
+        if not plan_logger.handlers:
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.SLOW_QUERY_PLAN_FILE_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_PLAN_FILE_BACKUPS,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            plan_logger.addHandler(handler)
+        return plan_logger
+
+    def install(self, engine: AsyncEngine) -> None:
+        def _check(timed: TimedStatement) -> None:
+            if timed.elapsed >= self.threshold:
+                self.record(engine, timed.statement, timed.parameters, timed.elapsed)
+
+        statement_hook(engine).subscribe(_check)
+
+    def record(self, engine: AsyncEngine, statement: str, parameters: Any, elapsed: float) -> None:
+        endpoint = current_endpoint()
+        normalized = normalize_statement(statement)
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) from {endpoint}: "
+            f"{_WHITESPACE.sub(' ', statement).strip()} params={redact_parameters(parameters)}"
+        )
+
+        stats = self._stats.get(normalized)
+        if stats is None:
+            if len(self._stats) >= self.max_statements:
+                # Forget the statement that has been least painful so far
+                del self._stats[min(self._stats, key=lambda k: self._stats[k].max)]
+            stats = self._stats[normalized] = StatementStats(normalized)
+        stats.count += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+        stats.last_seen = time.time()
+        stats.endpoint = endpoint
+
+        if self._should_explain(engine, statement, normalized):
+            self._explained[normalized] = time.monotonic()
+            task = asyncio.get_running_loop().create_task(
+                self._explain(engine, statement, parameters, normalized, elapsed, endpoint)
+            )
+            self._explaining.add(task)
+            task.add_done_callback(self._explain_done)
+
+    def _should_explain(self, engine: AsyncEngine, statement: str, normalized: str) -> bool:
+        if self._plan_logger is None or engine.dialect.name != "postgresql":
+            return False
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return False
+        last = self._explained.get(normalized)
+        if last is not None and time.monotonic() - last < self.explain_cooldown:
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def _explain_done(self, task: asyncio.Task) -> None:
+        self._explaining.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Recording the plan of a slow query failed: {task.exception()}")
+
+    async def _explain(self, engine, statement, parameters, normalized, elapsed, endpoint) -> None:
+        # One EXPLAIN at a time, so a burst of slow queries can't drain the pool
+        async with self._explain_lock:
+            try:
+                async with engine.connect() as conn:
+                    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plan = result.scalar()
+            except Exception as e:
+                logger.warning(f"EXPLAIN of slow query failed: {e}")
+                return
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self._plan_logger.info(json.dumps({
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "endpoint": endpoint,
+            "statement": normalized,
+            "plan": plan,
+        }))
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        ranked = sorted(self._stats.values(), key=lambda s: s.max, reverse=True)
+        return [stats.as_dict() for stats in ranked[:limit]]
+
+
+class SlowQueryContextMiddleware:
+    """Remember the current request so slow statements can name their endpoint."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_MS,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    plan_file=settings.SLOW_QUERY_PLAN_FILE,
+    max_statements=settings.SLOW_QUERY_MAX_STATEMENTS,
+)
@@ -0,0 +1,87 @@
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.responses import JSONResponse
+from starlette.types import Scope
+
+from app.core.admission import ROUTE_AUTH, ROUTE_EXPORT, ROUTE_WRITE, classify
+from app.core.config import settings
+
+# session.info key holding the budget of the request that owns the session
+SESSION_TIMEOUT_KEY = "statement_timeout_ms"
+# connection_record.info key holding the statement_timeout a connection started with
+_CONNECTION_DEFAULT_KEY = "default_statement_timeout_ms"
+
+# SQLSTATE query_canceled, raised when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+def statement_timeout_for(scope: Scope) -> int:
+    """Statement budget in milliseconds for a request's route class; 0 means none."""
+    route_class = classify(scope, settings.ADMISSION_EXPORT_MIN_LIMIT)
+    if route_class == ROUTE_AUTH:
+        return settings.STATEMENT_TIMEOUT_AUTH_MS
+    if route_class == ROUTE_WRITE:
+        return settings.STATEMENT_TIMEOUT_WRITE_MS
+    if route_class == ROUTE_EXPORT:
+        return settings.STATEMENT_TIMEOUT_EXPORT_MS
+    return settings.STATEMENT_TIMEOUT_READ_MS
+
+
+def install_default_timeout(engine: AsyncEngine, timeout_ms: int) -> None:
+    """
+    Remember the statement_timeout new connections of this engine start with
+    (set through server_settings), so transactions that want the same
+    budget skip the SET LOCAL round trip.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _remember_default(dbapi_connection, connection_record):
+        connection_record.info[_CONNECTION_DEFAULT_KEY] = timeout_ms
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    timeout_ms: Optional[int] = session.info.get(SESSION_TIMEOUT_KEY)
+    if timeout_ms is None or connection.dialect.name != "postgresql":
+        return
+    # Unknown default (e.g. behind a transaction pooler): assume the server's, no limit
+    if connection.info.get(_CONNECTION_DEFAULT_KEY, 0) == timeout_ms:
+        return
+    # Scoped to this transaction, so it is safe behind transaction poolers too
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    return getattr(getattr(exc, "orig", None), "sqlstate", None) == QUERY_CANCELED
+
+
+class StatementTimeout(OperationalError):
+    """A statement was cancelled by statement_timeout (SQLSTATE 57014)."""
+
+
+@event.listens_for(Engine, "handle_error")
+def _translate_statement_timeout(exception_context):
+    error = exception_context.sqlalchemy_exception
+    if error is None or not is_statement_timeout(error):
+        return None
+    return StatementTimeout(
+        error.statement,
+        error.params,
+        error.orig,
+        connection_invalidated=error.connection_invalidated,
+    )
+
+
+async def statement_timeout_handler(request: Request, exc: StatementTimeout):
+    """Answer 503 when a statement ran past its budget."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database query took too long"},
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,387 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_timing import TimedStatement, statement_hook
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# The active span; None when this request is not being traced
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class BatchExporter(ABC):
+    """Queue finished spans and write them from a background thread in batches."""
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 512, interval: float = 1.0):
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    @abstractmethod
+    def write(self, spans: List[Span]) -> None:
+        """Send one batch of spans; called from the exporter thread."""
+
+    def _drain(self) -> List[Span]:
+        spans = []
+        while len(spans) < self.batch_size:
+            try:
+                spans.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return spans
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        while True:
+            spans = self._drain()
+            if not spans:
+                return
+            try:
+                self.write(spans)
+            except Exception as e:
+                logger.warning(f"Dropping {len(spans)} spans, export failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class JsonLinesExporter(BatchExporter):
+    """Append one JSON object per span to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.as_dict(), default=str) + "\n")
+
+
+class OtlpHttpExporter(BatchExporter):
+    """
+    POST spans as OTLP/HTTP JSON to a collector's /v1/traces endpoint
+    (an OpenTelemetry Collector, Jaeger, Tempo, or any local stand-in).
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(self, span: Span) -> Dict[str, Any]:
+        data = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": self._value(v)} for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        return data
+
+    def write(self, spans: List[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}},
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "app.core.tracing"},
+                    "spans": [self._span(span) for span in spans],
+                }],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Tracer:
+    """
+    Minimal tracer: spans live in a contextvar, so children attach to whatever
+    span is active in the current task (and in SQLAlchemy's greenlets). The
+    sampling decision is made once per request; untraced requests only pay a
+    contextvar lookup per instrumented call.
+    """
+
+    def __init__(self, exporter: Optional[BatchExporter], sample_rate: float):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def should_sample(self, parent_sampled: Optional[bool]) -> bool:
+        if parent_sampled is not None:
+            return parent_sampled
+        return random.random() < self.sample_rate
+
+    def open_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        parent: Optional[Span] = None,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        **attributes: Any,
+    ) -> Span:
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        return Span(trace_id or _new_id(16), _new_id(8), parent_id, name, kind, attributes=attributes)
+
+    def close_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Child span of the active span; a no-op when nothing is being traced."""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = self.open_span(name, kind, parent=parent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            _current_span.reset(token)
+            self.close_span(span, e)
+            raise
+        _current_span.reset(token)
+        self.close_span(span)
+
+    def start(self) -> None:
+        if self.exporter is not None:
+            self.exporter.start()
+
+    def stop(self) -> None:
+        if self.exporter is not None:
+            self.exporter.stop()
+
+
+def traced(name: Optional[str] = None):
+    """Decorate a sync or async function so each call becomes a span."""
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await fn(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_methods(cls):
+    """Trace every public coroutine method of a service class."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+def parse_traceparent(header: Optional[str]):
+    """Return (trace_id, parent_id, sampled) from a W3C traceparent header, or None."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+def install_statement_tracing(engine: AsyncEngine) -> None:
+    """Record a client span for every SQL statement run inside a traced request."""
+    dialect = engine.dialect.name
+
+    def _open(timed: TimedStatement) -> None:
+        parent = _current_span.get()
+        if parent is not None:
+            timed.context["span"] = tracer.open_span(
+                "db " + timed.statement.lstrip().split(None, 1)[0].upper(),
+                SPAN_KIND_CLIENT,
+                parent=parent,
+                **{"db.system": dialect, "db.statement": timed.statement[:1000]},
+            )
+
+    def _close(timed: TimedStatement) -> None:
+        span = timed.context.get("span")
+        if span is not None:
+            tracer.close_span(span, timed.error)
+
+    statement_hook(engine).subscribe(_close, before=_open)
+
+
+class TracingMiddleware:
+    """Open the root server span for sampled requests, honouring an incoming traceparent."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        remote = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        if not tracer.should_sample(remote[2] if remote else None):
+            await self.app(scope, receive, send)
+            return
+
+        span = tracer.open_span(
+            f"{scope['method']} {scope['path']}",
+            SPAN_KIND_SERVER,
+            trace_id=remote[0] if remote else None,
+            parent_id=remote[1] if remote else None,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = _current_span.set(span)
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                span.name = f"{scope['method']} {route}"
+                span.attributes["http.route"] = route
+            tracer.close_span(span, error)
+
+
+def _build_exporter() -> Optional[BatchExporter]:
+    if not settings.TRACING_ENABLED:
+        return None
+    if settings.TRACING_EXPORTER == "otlp":
+        return OtlpHttpExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+    return JsonLinesExporter(settings.TRACING_FILE)
+
+
+tracer = Tracer(_build_exporter(), settings.TRACING_SAMPLE_RATE)
@@ -0,0 +1,85 @@
+import inspect
+from typing import AsyncGenerator, Awaitable, Callable, Union
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.invalidation import invalidation_bus
+from app.core.response_cache import TOPIC_CACHE_TAGS, response_cache
+from app.core.retry import mark_committed
+
+# session.info keys for work tied to the commit of the transaction
+_INVALIDATE_TAGS_KEY = "invalidate_tags"
+_BEFORE_COMMIT_KEY = "before_commit"
+_AFTER_COMMIT_KEY = "after_commit"
+
+BeforeCommit = Callable[[], Awaitable[None]]
+AfterCommit = Callable[[], Union[None, Awaitable[None]]]
+
+
+def invalidate_on_commit(session: AsyncSession, *tags: str) -> None:
+    """Invalidate response cache tags in every worker once the session commits."""
+    session.info.setdefault(_INVALIDATE_TAGS_KEY, set()).update(tags)
+
+
+def before_commit(session: AsyncSession, callback: BeforeCommit) -> None:
+    """Await callback inside the transaction, right before it commits."""
+    session.info.setdefault(_BEFORE_COMMIT_KEY, []).append(callback)
+
+
+def after_commit(session: AsyncSession, callback: AfterCommit) -> None:
+    """Run callback (plain or async) after the session commits; dropped on rollback."""
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+def has_pending_work(session: AsyncSession) -> bool:
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get("wrote")
+        or session.info.get(_INVALIDATE_TAGS_KEY)
+        or session.info.get(_BEFORE_COMMIT_KEY)
+        or session.info.get(_AFTER_COMMIT_KEY)
+    )
+
+
+async def commit(session: AsyncSession) -> None:
+    """
+    Commit the unit of work. Before-commit callbacks run and one invalidation
+    event for every staged cache tag is published inside the transaction;
+    after the commit, this worker drops those tags locally and the
+    after-commit callbacks run in order.
+    """
+    for callback in session.info.pop(_BEFORE_COMMIT_KEY, []):
+        await callback()
+    tags = session.info.pop(_INVALIDATE_TAGS_KEY, set())
+    callbacks = session.info.pop(_AFTER_COMMIT_KEY, [])
+    if tags:
+        await invalidation_bus.publish(session, TOPIC_CACHE_TAGS, tags=sorted(tags))
+    await session.commit()
+    mark_committed()
+    if tags:
+        await response_cache.invalidate_tags(*tags)
+    for callback in callbacks:
+        result = callback()
+        if inspect.isawaitable(result):
+            await result
+
+
+async def get_uow(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-wide unit of work. Services only flush; the request commits once
+    here, after the endpoint has returned and its response was serialized
+    but before it is sent, so a failed commit still turns into an error
+    response. Declare it as Depends(get_uow, scope="function"): with the
+    default request scope FastAPI runs this only after the response is out.
+    If the endpoint raises, nothing is committed and get_db rolls back.
+
+    Streaming endpoints, whose body is produced after this point, opt out by
+    depending on get_db and calling commit() themselves.
+    """
+    yield db
+    if has_pending_work(db):
+        await commit(db)
@@ -1,108 +1,185 @@
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
+from contextlib import asynccontextmanager
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
+from starlette.responses import Response
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.database import DatabaseManager, AsyncSessionLocal, invalidate_connection_pool
-from app.api.endpoints.auth import router as auth_router
-from app.api.endpoints.reports import router as reports_router
-from app.api.endpoints.admin import router as admin_router
-from app.api.endpoints.person import router as people_router
+from app.core.admission import AdmissionMiddleware, admission
+from app.core.retry import RetryMiddleware, RetryPolicy
+from app.core.disconnect import DisconnectCancelMiddleware
+from app.core.statement_timeout import StatementTimeout, statement_timeout_handler
+from app.core.compression import CompressionMiddleware, available_encoders
+from app.core.request_timing import ServerTimingMiddleware
+from app.core.metrics import MetricsMiddleware, pool_sampler, render_metrics
+from app.core.slow_query import SlowQueryContextMiddleware, slow_query_log
+from app.core.tracing import TracingMiddleware, tracer
+from app.core.recycler import RequestCountMiddleware, recycler
+from app.core.database import DatabaseManager, get_keepalive, reset_statement_caches
+from app.core.schema_version import schema_watcher
+from app.core.invalidation import invalidation_bus
+from app.core.idempotency import idempotency_collector
 
 logger = logging.getLogger(__name__)
 
 
-class InvalidCachedStatementMiddleware(BaseHTTPMiddleware):
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Imported with the routers rather than with this module
+    from app.services.sync_service import tombstone_collector
+
+    await schema_watcher.start()
+    if settings.DB_KEEPALIVE_SECONDS > 0:
+        await get_keepalive().start()
+    await invalidation_bus.start()
+    await pool_sampler.start()
+    tracer.start()
+    await recycler.start()
+    await idempotency_collector.start()
+    await tombstone_collector.start()
+    yield
+    await tombstone_collector.stop()
+    await idempotency_collector.stop()
+    await recycler.stop()
+    tracer.stop()
+    await pool_sampler.stop()
+    await invalidation_bus.stop()
+    if settings.DB_KEEPALIVE_SECONDS > 0:
+        await get_keepalive().stop()
+    await schema_watcher.stop()
+
+
+def create_app() -> FastAPI:
     """
-    Middleware to automatically handle InvalidCachedStatementError.
-    This error occurs when database schema changes (e.g., after migrations)
-    while the server is running, invalidating cached prepared statements.
-    """
-    async def dispatch(self, request: Request, call_next):
-        try:
-            response = await call_next(request)
-            return response
-        except Exception as exc:
-            # Check if it's the InvalidCachedStatementError
-            is_cached_error = (
-                isinstance(exc, AsyncAdapt_asyncpg_dbapi.InvalidCachedStatementError) or
-                (hasattr(exc, '__cause__') and 
-                 isinstance(exc.__cause__, AsyncAdapt_asyncpg_dbapi.InvalidCachedStatementError)) or
-                (hasattr(exc, 'orig') and 
-                 isinstance(exc.orig, AsyncAdapt_asyncpg_dbapi.InvalidCachedStatementError))
-            )
-            
-            if is_cached_error:
-                logger.warning(
-                    "InvalidCachedStatementError detected. "
-                    "Invalidating connection pool and retrying request..."
-                )
-                try:
-                    # Invalidate the connection pool
-                    await invalidate_connection_pool()
-                    # Retry the request once
-                    response = await call_next(request)
-                    return response
-                except Exception as retry_exc:
-                    logger.error(f"Error after invalidating pool: {retry_exc}")
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "detail": (
-                                "Database schema changed. Please restart the server "
-                                "or call POST /admin/invalidate-pool endpoint."
-                            )
-                        }
-                    )
-            # Re-raise if it's not the cached statement error
-            raise
-
-
-app = FastAPI(title="Evangelism App")
-
-app.add_middleware(InvalidCachedStatementMiddleware)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# check the api health
-@app.get("/health")
-async def health():
-    db_ok = await DatabaseManager.health_check()
-    return {"database": db_ok, "status": "ok" if db_ok else "error"}
-
-
-@app.post("/admin/invalidate-pool")
-async def invalidate_pool():
-    """
-    Invalidate the database connection pool.
-    Call this endpoint after running Alembic migrations to clear cached prepared statements.
-    This fixes the InvalidCachedStatementError that occurs after schema changes.
-    """
-    await invalidate_connection_pool()
-    return {"message": "Connection pool invalidated successfully"}
-
-
-# all routes 
-app.include_router(auth_router, prefix="/api/auth")
-app.include_router(reports_router, prefix="/api/reports", tags=["reports"])
-app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
-app.include_router(people_router, prefix="/api/people", tags=["people"])
-
+    Build the application.
 
+    Routers (and with them the schemas, services and auth dependencies) are
+    imported here rather than at module level; the database engine is only
+    created on first use.
+    """
+    from app.api.dependencies import require_admin
+    from app.models.user import User
+    from app.api.endpoints.auth import router as auth_router
+    from app.api.endpoints.reports import router as reports_router
+    from app.api.endpoints.admin import router as admin_router
+    from app.api.endpoints.person import router as people_router
+    from app.api.endpoints.profiling import router as profiling_router
+    from app.api.endpoints.sync import router as sync_router
+    from app.api.endpoints.live import router as live_router
+
+    app = FastAPI(title="Evangelism App", lifespan=lifespan)
+
+    # Innermost, so a retried request keeps its admission slot and is timed as one request
+    app.add_middleware(
+        RetryMiddleware,
+        policy=RetryPolicy(
+            settings.DB_RETRY_MAX_ATTEMPTS,
+            settings.DB_RETRY_BASE_DELAY_SECONDS,
+            settings.DB_RETRY_MAX_DELAY_SECONDS,
+            settings.DB_RETRY_BUDGET_SECONDS,
+        ),
+    )
+    if settings.ADMISSION_ENABLED:
+        # Inside CORS and metrics, so preflights are never shed and rejections are counted
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+    if settings.CANCEL_ON_DISCONNECT:
+        # Outside admission, so a request abandoned in the queue gives up its place
+        app.add_middleware(DisconnectCancelMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            thread_size=settings.COMPRESSION_THREAD_SIZE,
+            encoders=available_encoders(
+                settings.COMPRESSION_GZIP_LEVEL,
+                settings.COMPRESSION_BROTLI_QUALITY,
+                settings.COMPRESSION_ZSTD_LEVEL,
+            ),
+        )
+    if settings.SERVER_TIMING_ENABLED:
+        app.add_middleware(
+            ServerTimingMiddleware,
+            query_log_threshold=settings.SERVER_TIMING_QUERY_LOG_THRESHOLD,
+        )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    if slow_query_log.enabled:
+        app.add_middleware(SlowQueryContextMiddleware)
+    if tracer.enabled:
+        app.add_middleware(TracingMiddleware)
+    if recycler.enabled:
+        app.add_middleware(RequestCountMiddleware, recycler=recycler)
+
+    app.add_exception_handler(StatementTimeout, statement_timeout_handler)
+
+    @app.get("/health/live")
+    async def health_live():
+        """Liveness probe; answers without touching the database."""
+        return {"status": "ok"}
+
+    # check the api health
+    @app.get("/health")
+    async def health():
+        db_ok = await DatabaseManager.health_check()
+        return {"database": db_ok, "status": "ok" if db_ok else "error"}
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request):
+        """Prometheus metrics in text exposition format."""
+        if not settings.METRICS_ENABLED:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    @app.post("/admin/invalidate-pool")
+    async def invalidate_pool(current_user: User = Depends(require_admin)):
+        """
+        Reset cached prepared statements on the pooled connections.
+        Call this endpoint after running Alembic migrations if the schema watcher
+        has not picked up the change yet. Connections are kept open.
+        Only accessible by admins.
+        """
+        reset_statement_caches()
+        await schema_watcher.check()
+        return {
+            "message": "Prepared statement caches reset successfully",
+            "schema_version": schema_watcher.version,
+        }
+
+    # all routes 
+    app.include_router(auth_router, prefix="/api/auth")
+    app.include_router(reports_router, prefix="/api/reports", tags=["reports"])
+    app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
+    app.include_router(people_router, prefix="/api/people", tags=["people"])
+    app.include_router(sync_router, prefix="/api/sync", tags=["sync"])
+    app.include_router(live_router, prefix="/api/ws", tags=["live"])
+    app.include_router(profiling_router, prefix="/api/admin/profiling", tags=["admin"])
+
+    return app
+
+
+def __getattr__(name: str):
+    # `uvicorn app.main:app` and `from app.main import app` keep working; the
+    # app is built on first access instead of at import
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-import os
-import uvicorn
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))  # 8000 fallback for local
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port)
+    # Multi-worker production launcher; see app/server.py for options
+    from app.server import main
+
+    main()
@@ -1,4 +1,6 @@
 from .user import User, UserRole
 from .outreachReport import OutreachReport
 from .person import Person
-from .password_reset import PasswordResetToken  
+from .password_reset import PasswordResetToken
+from .idempotency_key import IdempotencyKey
+from .sync_tombstone import SyncTombstone
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime, SmallInteger, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    First response to a request sent with an Idempotency-Key header.
+
+    The row is claimed and its response stored in the request's own
+    transaction, so a committed row always carries the response.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # expired keys are collected in batches
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(LargeBinary, nullable=False)  # sha256 of method, path and body
+    status_code = Column(SmallInteger)
+    response_body = Column(LargeBinary)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
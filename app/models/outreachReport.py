@@ -1,12 +1,17 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Date, Integer, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, String, Date, Integer, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class OutreachReport(Base):
     __tablename__ = "outreach_reports"
+    __table_args__ = (
+        # list ETags and delta sync scan updated_at, scoped per evangelist or globally
+        Index("ix_outreach_reports_evangelist_id_updated_at", "evangelist_id", "updated_at"),
+        Index("ix_outreach_reports_updated_at", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     evangelist_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Date, Integer, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, String, Date, Integer, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -8,6 +8,11 @@ from app.core.database import Base
 
 class Person(Base):
     __tablename__ = "people"
+    __table_args__ = (
+        # list ETags and delta sync scan updated_at, scoped per report or globally
+        Index("ix_people_report_id_updated_at", "report_id", "updated_at"),
+        Index("ix_people_updated_at", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     report_id = Column(UUID(as_uuid=True), ForeignKey("outreach_reports.id"), nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class SyncTombstone(Base):
+    """
+    Marker left behind by a hard delete, so delta sync can tell offline
+    clients which reports and people are gone. A person moved to another
+    evangelist's report leaves one for the previous owner.
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        # delta sync scans deletions per evangelist or globally; expiry scans deleted_at
+        Index("ix_sync_tombstones_evangelist_id_deleted_at", "evangelist_id", "deleted_at"),
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+    entity = Column(String(16), primary_key=True)  # "report" or "person"
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+    evangelist_id = Column(UUID(as_uuid=True), primary_key=True)  # whose view the row left
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
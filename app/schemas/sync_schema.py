@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from uuid import UUID
+from typing import List, Optional
+
+from app.schemas.report_schema import ReportBase, ReportResponse
+from app.schemas.person_schema import PersonBase, PersonResponse
+
+# Most reports, people or deletions of each kind one upload may carry
+SYNC_MAX_UPLOAD_ITEMS = 500
+
+class SyncDeleted(BaseModel):
+    reports: List[UUID] = Field(default_factory=list, max_length=SYNC_MAX_UPLOAD_ITEMS)
+    people: List[UUID] = Field(default_factory=list, max_length=SYNC_MAX_UPLOAD_ITEMS)
+
+class SyncChanges(BaseModel):
+    reports: List[ReportResponse]
+    people: List[PersonResponse]
+    deleted: SyncDeleted
+    # Pass back as `since`; with has_more, call again right away for the next page
+    watermark: datetime
+    has_more: bool
+
+class SyncReportUpsert(ReportBase):
+    # Generated by the client, so people recorded offline can point at the report
+    id: UUID
+    # updated_at of the server version the change was made to; omit to overwrite
+    updated_at: Optional[datetime] = None
+
+class SyncPersonUpsert(PersonBase):
+    id: UUID
+    updated_at: Optional[datetime] = None
+
+class SyncUpload(BaseModel):
+    reports: List[SyncReportUpsert] = Field(default_factory=list, max_length=SYNC_MAX_UPLOAD_ITEMS)
+    people: List[SyncPersonUpsert] = Field(default_factory=list, max_length=SYNC_MAX_UPLOAD_ITEMS)
+    deleted: SyncDeleted = Field(default_factory=SyncDeleted)
+
+class SyncConflicts(BaseModel):
+    # Current server versions of rows changed on the server since the client saw them
+    reports: List[ReportResponse]
+    people: List[PersonResponse]
+    # Rows the client changed that were deleted on the server
+    deleted: SyncDeleted
+
+class SyncUploadResult(BaseModel):
+    reports: List[ReportResponse]
+    people: List[PersonResponse]
+    conflicts: SyncConflicts
@@ -0,0 +1,144 @@
+"""
+Production launcher.
+
+Runs the API under uvicorn's multiprocess supervisor with uvloop and
+httptools, one worker per available CPU unless WEB_CONCURRENCY or --workers
+says otherwise. Workers that exit (crash, or recycled on the request/RSS
+limits in app.core.recycler) are replaced. The worker count is exported as
+WEB_CONCURRENCY so each worker sizes its DB pool from the shared
+DB_MAX_CONNECTIONS budget.
+
+    python -m app.server
+    python -m app.server --workers 4 --port 8000
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+import uvicorn
+from uvicorn.supervisors.multiprocess import Multiprocess
+
+from app.core.config import derive_pool_sizes, settings
+from app.core.recycler import SUPERVISED_ENV
+
+logger = logging.getLogger("app.server")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def resolve_workers(requested: Optional[int]) -> int:
+    if requested:
+        return requested
+    if os.environ.get("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    return available_cpus()
+
+
+def fit_connection_budget(workers: int) -> int:
+    """
+    Cap workers so each still gets a usable pool from DB_MAX_CONNECTIONS, and
+    log what every worker will open.
+    """
+    if settings.DB_POOLER_MODE and settings.DB_POOLER_POOL == "null":
+        logger.info(f"{workers} workers, pooler mode without a local pool")
+        return workers
+    if settings.DB_MAX_CONNECTIONS is None:
+        per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        logger.warning(
+            f"{workers} workers x {per_worker} connections = {workers * per_worker} at peak; "
+            "set DB_MAX_CONNECTIONS to split the server's limit across workers"
+        )
+        return workers
+
+    per_worker_extra = 1 if settings.INVALIDATION_BUS_ENABLED else 0
+    usable = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    # Every worker needs at least a 2-connection pool plus its listener
+    max_workers = max(1, usable // (2 + per_worker_extra))
+    if workers > max_workers:
+        logger.warning(
+            f"Reducing workers from {workers} to {max_workers} to fit DB_MAX_CONNECTIONS="
+            f"{settings.DB_MAX_CONNECTIONS}"
+        )
+        workers = max_workers
+    pool_size, max_overflow = derive_pool_sizes(
+        settings.DB_MAX_CONNECTIONS,
+        workers,
+        reserved=settings.DB_RESERVED_CONNECTIONS + workers * per_worker_extra,
+    )
+    logger.info(f"{workers} workers, each with pool_size={pool_size} max_overflow={max_overflow}")
+    return workers
+
+
+def prepare_multiprocess_metrics(workers: int) -> None:
+    """Give prometheus_client a clean shared directory when there are several workers."""
+    if workers < 2:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path = tempfile.mkdtemp(prefix="evang-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    os.makedirs(path, exist_ok=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, help="Default: WEB_CONCURRENCY or the number of available CPUs")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    args = build_parser().parse_args(argv)
+
+    workers = fit_connection_budget(resolve_workers(args.workers))
+    # Read by every worker's Settings; children inherit the environment
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    os.environ[SUPERVISED_ENV] = "1"
+    prepare_multiprocess_metrics(workers)
+
+    config = uvicorn.Config(
+        "app.main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+    )
+    server = uvicorn.Server(config)
+    sock = config.bind_socket()
+    # The supervisor is used even for one worker so recycled workers are replaced
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+
+if __name__ == "__main__":
+    main()
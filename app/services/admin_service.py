@@ -5,7 +5,10 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.core.response_cache import CACHE_TAG_USERS
+from app.core.unit_of_work import invalidate_on_commit
+from app.core.tracing import traced_methods
+from app.core.security import get_password_hash_async
 from app.models.user import User
 from app.schemas.user_schema import (
     AdminUserCreateSchema,
@@ -14,6 +17,7 @@ from app.schemas.user_schema import (
 )
 
 
+@traced_methods
 class AdminService:
     """Admin-focused operations such as user management."""
 
@@ -38,13 +42,13 @@ class AdminService:
             email=user_in.email,
             phone_number=user_in.phone_number,
             role=user_in.role,
-            password_hash=get_password_hash(user_in.password),
+            password_hash=await get_password_hash_async(user_in.password),
             is_active=user_in.is_active,
         )
 
         self.db.add(new_user)
-        await self.db.commit()
-        await self.db.refresh(new_user)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_USERS)
         return new_user
 
     async def _get_user_or_raise(self, user_id: UUID) -> User:
@@ -59,8 +63,8 @@ class AdminService:
     ) -> User:
         user = await self._get_user_or_raise(user_id)
         user.role = role_update.role
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_USERS)
         return user
 
     async def update_user_status(
@@ -68,7 +72,7 @@ class AdminService:
     ) -> User:
         user = await self._get_user_or_raise(user_id)
         user.is_active = status_update.is_active
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_USERS)
         return user
 
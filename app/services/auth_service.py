@@ -4,6 +4,9 @@ from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.response_cache import CACHE_TAG_USERS
+from app.core.unit_of_work import after_commit, invalidate_on_commit
+from app.core.tracing import traced_methods
 from app.models.password_reset import PasswordResetToken
 from app.utils.send_mail import send_email
 
@@ -11,8 +14,8 @@ from app.core.security import (
     TOKEN_TYPE_REFRESH,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     verify_token,
 )
 from app.models.user import User, UserRole
@@ -27,6 +30,7 @@ from app.schemas.user_schema import (
 )
 
 
+@traced_methods
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -51,20 +55,20 @@ class AuthService:
             email=payload.email,
             phone_number=payload.phone_number,
             role=UserRole.evangelist,
-            password_hash=get_password_hash(payload.password),
+            password_hash=await get_password_hash_async(payload.password),
             is_active=payload.is_active,
         )
 
         self.db.add(new_user)
-        await self.db.commit()
-        await self.db.refresh(new_user)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_USERS)
         return UserSchema.model_validate(new_user, from_attributes=True)
     
 
     # authenticate user
     async def authenticate_user(self, payload: LoginRequest) -> User:
         user = await self._get_user_by_email(payload.email)
-        if not user or not verify_password(payload.password, user.password_hash):
+        if not user or not await verify_password_async(payload.password, user.password_hash):
              raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid Credentials",
@@ -107,7 +111,7 @@ class AuthService:
         # 2. Generate and store token
         token = PasswordResetToken.generate(user.email)
         await self.db.merge(token)
-        await self.db.commit()
+        await self.db.flush()
 
         reset_link = f"http://localhost:3000/reset-password?token={token.token}"
 
@@ -122,7 +126,8 @@ class AuthService:
             <p>This link expires in <strong>15 minutes</strong>.</p>
         """
 
-        send_email(user.email, "Password Reset", html)
+        # Only mail a link whose token was actually stored
+        after_commit(self.db, lambda: send_email(user.email, "Password Reset", html))
 
 
     # Reset password
@@ -153,13 +158,13 @@ class AuthService:
             raise HTTPException(404, "User not found")
 
         # 5. Update password
-        user.password_hash = get_password_hash(payload.password)
+        user.password_hash = await get_password_hash_async(payload.password)
 
         # 6. One-time token → remove it
         await self.db.delete(reset_token)
 
         # 7. Save changes
-        await self.db.commit()
+        await self.db.flush()
 
         
 
@@ -1,16 +1,33 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.live_events import (
+    OP_CREATED,
+    OP_DELETED,
+    OP_UPDATED,
+    live_events,
+    person_event,
+    person_moved_event,
+)
+from app.core.response_cache import CACHE_TAG_PEOPLE
+from app.core.unit_of_work import invalidate_on_commit
+from app.core.tracing import traced_methods
+from app.services.sync_service import ENTITY_PERSON, record_person_moved, record_tombstone
 from app.models.outreachReport import OutreachReport
 from app.models.person import Person
 from app.models.user import User, UserRole
-from app.schemas.person_schema import PersonCreate, PersonUpdate
+from app.schemas.person_schema import PersonCreate, PersonResponse, PersonUpdate, SpiritualStatus
 
+# Columns fetched by read-only listings, in PersonResponse field order
+_PERSON_COLUMNS = [getattr(Person, name) for name in PersonResponse.model_fields]
 
+
+@traced_methods
 class PersonService:
     """Business logic for CRUD operations on people linked to reports."""
 
@@ -65,24 +82,48 @@ class PersonService:
         current_user: User,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Person]:
-        query = select(Person).join(OutreachReport)
+    ) -> List[PersonResponse]:
+        """
+        Return people scoped by user role.
+        Read-only: rows are fetched as plain columns and mapped straight into
+        response objects, skipping ORM identity-map hydration.
+        """
+        query = select(*_PERSON_COLUMNS).join(OutreachReport)
         if current_user.role != UserRole.admin:
             query = query.where(OutreachReport.evangelist_id == current_user.id)
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return [
+            PersonResponse.model_construct(**{**row, "status": SpiritualStatus(row["status"])})
+            for row in result.mappings()
+        ]
+
+    async def list_people_version(
+        self,
+        current_user: User,
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Return (count, latest updated_at) of the people visible to the user.
+        Cheap indexed aggregate used to validate list ETags.
+        """
+        query = select(func.count(Person.id), func.max(Person.updated_at)).join(OutreachReport)
+        if current_user.role != UserRole.admin:
+            query = query.where(OutreachReport.evangelist_id == current_user.id)
+        result = await self.db.execute(query)
+        count, last_modified = result.one()
+        return count, last_modified
 
     async def create_person(
         self,
         person_in: PersonCreate,
         current_user: User,
     ) -> Person:
-        await self._ensure_report_access(person_in.report_id, current_user)
+        report = await self._ensure_report_access(person_in.report_id, current_user)
         person = Person(**person_in.model_dump())
         self.db.add(person)
-        await self.db.commit()
-        await self.db.refresh(person)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_PEOPLE)
+        live_events.emit(self.db, person_event(OP_CREATED, person, report.evangelist_id))
         return person
 
     async def update_person(
@@ -91,17 +132,23 @@ class PersonService:
         person_update: PersonUpdate,
         current_user: User,
     ) -> Person:
-        person = await self.ensure_person_access(person_id, current_user)
+        person = await self._get_person_or_raise(person_id)
+        report = previous_report = await self._ensure_report_access(person.report_id, current_user)
         if person_update.report_id:
-            await self._ensure_report_access(person_update.report_id, current_user)
+            report = await self._ensure_report_access(person_update.report_id, current_user)
 
         update_data = person_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(person, field, value)
+        if report.evangelist_id != previous_report.evangelist_id:
+            await record_person_moved(self.db, person.id, previous_report.evangelist_id, report.evangelist_id)
 
         self.db.add(person)
-        await self.db.commit()
-        await self.db.refresh(person)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_PEOPLE)
+        live_events.emit(self.db, person_event(OP_UPDATED, person, report.evangelist_id))
+        if report.evangelist_id != previous_report.evangelist_id:
+            live_events.emit(self.db, person_moved_event(person, previous_report))
         return person
 
     async def delete_person(
@@ -109,7 +156,11 @@ class PersonService:
         person_id: UUID,
         current_user: User,
     ) -> None:
-        person = await self.ensure_person_access(person_id, current_user)
+        person = await self._get_person_or_raise(person_id)
+        report = await self._ensure_report_access(person.report_id, current_user)
+        record_tombstone(self.db, ENTITY_PERSON, person.id, report.evangelist_id)
         await self.db.delete(person)
-        await self.db.commit()
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_PEOPLE)
+        live_events.emit(self.db, person_event(OP_DELETED, person, report.evangelist_id))
 
@@ -1,15 +1,25 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.live_events import OP_CREATED, OP_DELETED, OP_UPDATED, live_events, report_event
+from app.core.response_cache import CACHE_TAG_REPORTS
+from app.core.unit_of_work import invalidate_on_commit
+from app.core.tracing import traced_methods
+from app.services.sync_service import ENTITY_REPORT, record_tombstone
 from app.models.outreachReport import OutreachReport
 from app.models.user import User, UserRole
-from app.schemas.report_schema import ReportCreate, ReportUpdate
+from app.schemas.report_schema import ReportCreate, ReportResponse, ReportUpdate
 
+# Columns fetched by read-only listings, in ReportResponse field order
+_REPORT_COLUMNS = [getattr(OutreachReport, name) for name in ReportResponse.model_fields]
 
+
+@traced_methods
 class ReportService:
     """Business logic for CRUD operations on outreach reports."""
 
@@ -21,16 +31,35 @@ class ReportService:
         current_user: User,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[OutreachReport]:
-        """Return reports scoped by user role."""
-        query = select(OutreachReport).order_by(desc(OutreachReport.date))
+    ) -> List[ReportResponse]:
+        """
+        Return reports scoped by user role.
+        Read-only: rows are fetched as plain columns and mapped straight into
+        response objects, skipping ORM identity-map hydration.
+        """
+        query = select(*_REPORT_COLUMNS).order_by(desc(OutreachReport.date))
 
         if current_user.role != UserRole.admin:
             query = query.where(OutreachReport.evangelist_id == current_user.id)
 
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return [ReportResponse.model_construct(**row) for row in result.mappings()]
+
+    async def list_reports_version(
+        self,
+        current_user: User,
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Return (count, latest updated_at) of the reports visible to the user.
+        Cheap indexed aggregate used to validate list ETags.
+        """
+        query = select(func.count(), func.max(OutreachReport.updated_at)).select_from(OutreachReport)
+        if current_user.role != UserRole.admin:
+            query = query.where(OutreachReport.evangelist_id == current_user.id)
+        result = await self.db.execute(query)
+        count, last_modified = result.one()
+        return count, last_modified
 
     async def create_report(
         self,
@@ -43,8 +72,9 @@ class ReportService:
             evangelist_id=current_user.id,
         )
         self.db.add(report)
-        await self.db.commit()
-        await self.db.refresh(report)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_REPORTS)
+        live_events.emit(self.db, report_event(OP_CREATED, report))
         return report
 
     async def update_report(
@@ -58,14 +88,18 @@ class ReportService:
             setattr(report, field, value)
 
         self.db.add(report)
-        await self.db.commit()
-        await self.db.refresh(report)
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_REPORTS)
+        live_events.emit(self.db, report_event(OP_UPDATED, report))
         return report
 
     async def delete_report(self, report: OutreachReport) -> None:
-        """Delete a report."""
+        """Delete a report, leaving a tombstone for delta sync."""
+        record_tombstone(self.db, ENTITY_REPORT, report.id, report.evangelist_id)
         await self.db.delete(report)
-        await self.db.commit()
+        await self.db.flush()
+        invalidate_on_commit(self.db, CACHE_TAG_REPORTS)
+        live_events.emit(self.db, report_event(OP_DELETED, report))
 
     async def get_report_by_id(
         self,
@@ -0,0 +1,364 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, exists, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.core.expiry import ExpiredRowCollector
+from app.core.live_events import (
+    OP_CREATED,
+    OP_DELETED,
+    OP_UPDATED,
+    live_events,
+    person_event,
+    person_moved_event,
+    report_event,
+)
+from app.core.response_cache import CACHE_TAG_PEOPLE, CACHE_TAG_REPORTS
+from app.core.unit_of_work import invalidate_on_commit
+from app.core.tracing import traced_methods
+from app.models.outreachReport import OutreachReport
+from app.models.person import Person
+from app.models.sync_tombstone import SyncTombstone
+from app.models.user import User, UserRole
+from app.schemas.person_schema import PersonResponse, SpiritualStatus
+from app.schemas.report_schema import ReportResponse
+from app.schemas.sync_schema import (
+    SyncChanges,
+    SyncConflicts,
+    SyncDeleted,
+    SyncUpload,
+    SyncUploadResult,
+)
+
+ENTITY_REPORT = "report"
+ENTITY_PERSON = "person"
+
+# Columns fetched by delta sync, in response field order
+_REPORT_COLUMNS = [getattr(OutreachReport, name) for name in ReportResponse.model_fields]
+_PERSON_COLUMNS = [getattr(Person, name) for name in PersonResponse.model_fields]
+
+
+def record_tombstone(db: AsyncSession, entity: str, entity_id: UUID, evangelist_id: UUID) -> None:
+    """Remember a hard delete so delta sync can hand it to offline clients."""
+    db.add(SyncTombstone(
+        entity=entity,
+        entity_id=entity_id,
+        evangelist_id=evangelist_id,
+        deleted_at=datetime.now(timezone.utc),
+    ))
+
+
+async def record_person_moved(db: AsyncSession, person_id: UUID, previous_owner: UUID, owner: UUID) -> None:
+    """
+    A person moved to a report of another evangelist: for the previous
+    owner's clients it is deleted. A tombstone left by an earlier move away
+    from the new owner no longer holds.
+    """
+    await db.execute(
+        delete(SyncTombstone).where(
+            SyncTombstone.entity == ENTITY_PERSON,
+            SyncTombstone.entity_id == person_id,
+            SyncTombstone.evangelist_id == owner,
+        )
+    )
+    record_tombstone(db, ENTITY_PERSON, person_id, previous_owner)
+
+
+def _aware(value: datetime) -> datetime:
+    # sqlite hands back naive datetimes for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@traced_methods
+class SyncService:
+    """Delta sync of reports and people for offline-first clients."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _scan(self, query, column, since: Optional[datetime], horizon: datetime, limit: int) -> list:
+        """Rows of query changed in [since, horizon), oldest first, at most limit + 1."""
+        if since is not None:
+            query = query.where(column >= since)
+        query = query.where(column < horizon).order_by(column).limit(limit + 1)
+        return (await self.db.execute(query)).mappings().all()
+
+    async def _horizon(self, now: datetime) -> datetime:
+        """
+        The newest watermark that can be handed out: SYNC_SETTLE_SECONDS ago,
+        and no later than that before the start of the oldest transaction
+        that has written and not committed yet.
+
+        Rows are stamped in Python at flush but only become visible at
+        commit, which can come any time later; a write transaction cannot
+        stamp a row earlier than its start, give or take the settle margin
+        (clock skew between app and database, the flush that opens it).
+        """
+        horizon = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        if self.db.get_bind().dialect.name != "postgresql":
+            return horizon
+        oldest = await self.db.scalar(text(
+            "SELECT min(xact_start) FROM pg_stat_activity"
+            " WHERE backend_xid IS NOT NULL AND datname = current_database()"
+        ))
+        if oldest is None:
+            return horizon
+        return min(horizon, oldest - timedelta(seconds=settings.SYNC_SETTLE_SECONDS))
+
+    async def changes(
+        self,
+        current_user: User,
+        since: Optional[datetime],
+        limit: int,
+    ) -> SyncChanges:
+        """
+        Reports, people and deletions visible to the user that changed since
+        the watermark, each found by an indexed range scan on updated_at
+        (deleted_at for tombstones).
+
+        Only changes from before the horizon (see _horizon) are returned, so
+        rows of transactions still in flight are not skipped by the watermark
+        handed out. When a scan hits the limit, the page ends before the
+        first row that was left out and has_more is set; when more than
+        limit rows share that row's timestamp, they all go in this page.
+        """
+        now = datetime.now(timezone.utc)
+        if since is not None:
+            since = _aware(since)
+            if since < now - timedelta(days=settings.SYNC_TOMBSTONE_TTL_DAYS):
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="Watermark is older than the kept deletion history; sync from scratch",
+                )
+        horizon = await self._horizon(now)
+        if since is not None and since >= horizon:
+            return SyncChanges(
+                reports=[], people=[], deleted=SyncDeleted(), watermark=since, has_more=False,
+            )
+
+        reports = select(*_REPORT_COLUMNS)
+        people = select(*_PERSON_COLUMNS).join(OutreachReport)
+        tombstones = select(SyncTombstone.entity_id, SyncTombstone.deleted_at)
+        if current_user.role != UserRole.admin:
+            reports = reports.where(OutreachReport.evangelist_id == current_user.id)
+            people = people.where(OutreachReport.evangelist_id == current_user.id)
+            tombstones = tombstones.where(SyncTombstone.evangelist_id == current_user.id)
+        person_tombstones = tombstones.where(SyncTombstone.entity == ENTITY_PERSON)
+        if current_user.role == UserRole.admin:
+            # Admins see every report: a person that only moved to another one is still there
+            person_tombstones = person_tombstones.where(~exists().where(Person.id == SyncTombstone.entity_id))
+
+        scans = [
+            (reports, OutreachReport.updated_at),
+            (people, Person.updated_at),
+            (tombstones.where(SyncTombstone.entity == ENTITY_REPORT), SyncTombstone.deleted_at),
+            (person_tombstones, SyncTombstone.deleted_at),
+        ]
+        pages = []
+        watermark = horizon
+        for query, column in scans:
+            rows = await self._scan(query, column, since, horizon, limit)
+            if len(rows) > limit:
+                cut = _aware(rows[limit][column.key])
+                if cut == _aware(rows[0][column.key]):
+                    # The whole page shares one timestamp; a watermark at it
+                    # would never move, so take every row stamped with it
+                    rows = (await self.db.execute(query.where(column == cut))).mappings().all()
+                    cut += timedelta(microseconds=1)
+                watermark = min(watermark, cut)
+            pages.append((rows, column.key))
+        report_rows, person_rows, deleted_report_rows, deleted_person_rows = [
+            [row for row in rows if _aware(row[key]) < watermark] for rows, key in pages
+        ]
+
+        return SyncChanges.model_construct(
+            reports=[ReportResponse.model_construct(**row) for row in report_rows],
+            people=[
+                PersonResponse.model_construct(**{**row, "status": SpiritualStatus(row["status"])})
+                for row in person_rows
+            ],
+            deleted=SyncDeleted.model_construct(
+                reports=[row["entity_id"] for row in deleted_report_rows],
+                # A person that moved before it was deleted has a tombstone per owner
+                people=list(dict.fromkeys(row["entity_id"] for row in deleted_person_rows)),
+            ),
+            watermark=watermark,
+            has_more=watermark < horizon,
+        )
+
+    @staticmethod
+    def _ensure_access(report: OutreachReport, current_user: User) -> None:
+        if current_user.role != UserRole.admin and report.evangelist_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only access your own reports",
+            )
+
+    async def _load(self, model, ids: Iterable[UUID]) -> Dict[UUID, object]:
+        ids = set(ids)
+        if not ids:
+            return {}
+        result = await self.db.execute(select(model).where(model.id.in_(ids)))
+        return {row.id: row for row in result.scalars()}
+
+    async def _tombstoned(self, keys: Set[Tuple[str, UUID]]) -> Set[Tuple[str, UUID]]:
+        if not keys:
+            return set()
+        result = await self.db.execute(
+            select(SyncTombstone.entity, SyncTombstone.entity_id)
+            .where(tuple_(SyncTombstone.entity, SyncTombstone.entity_id).in_(keys))
+        )
+        return {tuple(row) for row in result}
+
+    async def apply(self, current_user: User, upload: SyncUpload) -> SyncUploadResult:
+        """
+        Apply a batch of offline changes; the request commits them together.
+
+        Reports and people are upserted by their client-generated ids. A change
+        based on an older server version (its updated_at is behind the row's)
+        or aimed at a row deleted on the server is skipped and returned as a
+        conflict instead. Access errors reject the whole batch.
+        """
+        people = await self._load(Person, [p.id for p in upload.people] + upload.deleted.people)
+        reports = await self._load(
+            OutreachReport,
+            [r.id for r in upload.reports]
+            + upload.deleted.reports
+            + [p.report_id for p in upload.people]
+            + [p.report_id for p in people.values()],
+        )
+        # A tombstone for a row that still exists only records a move to another evangelist
+        tombstoned = await self._tombstoned(
+            {(ENTITY_REPORT, r.id) for r in upload.reports if r.id not in reports}
+            | {(ENTITY_PERSON, p.id) for p in upload.people if p.id not in people}
+        )
+
+        applied_reports: List[OutreachReport] = []
+        applied_people: List[Person] = []
+        stale_reports: List[OutreachReport] = []
+        stale_people: List[Person] = []
+        created: Set[UUID] = set()
+        deleted_people: List[Person] = []
+        # People moved to another evangelist's report, with the report they left
+        moved_people: List[Tuple[Person, OutreachReport]] = []
+        gone = SyncDeleted()
+
+        for item in upload.reports:
+            if (ENTITY_REPORT, item.id) in tombstoned:
+                gone.reports.append(item.id)
+                continue
+            data = item.model_dump(exclude={"id", "updated_at"})
+            report = reports.get(item.id)
+            if report is None:
+                report = OutreachReport(id=item.id, evangelist_id=current_user.id, **data)
+                self.db.add(report)
+                created.add(item.id)
+                reports[item.id] = report
+            else:
+                self._ensure_access(report, current_user)
+                if item.updated_at is not None and _aware(report.updated_at) > _aware(item.updated_at):
+                    stale_reports.append(report)
+                    continue
+                for field, value in data.items():
+                    setattr(report, field, value)
+            applied_reports.append(report)
+
+        for item in upload.people:
+            if (ENTITY_PERSON, item.id) in tombstoned:
+                gone.people.append(item.id)
+                continue
+            target = reports.get(item.report_id)
+            if target is None:
+                raise HTTPException(status_code=404, detail="Report not found")
+            self._ensure_access(target, current_user)
+            data = item.model_dump(exclude={"id", "updated_at"})
+            person = people.get(item.id)
+            if person is None:
+                person = Person(id=item.id, **data)
+                self.db.add(person)
+                created.add(item.id)
+                people[item.id] = person
+            else:
+                previous = reports[person.report_id]
+                self._ensure_access(previous, current_user)
+                if item.updated_at is not None and _aware(person.updated_at) > _aware(item.updated_at):
+                    stale_people.append(person)
+                    continue
+                for field, value in data.items():
+                    setattr(person, field, value)
+                if target.evangelist_id != previous.evangelist_id:
+                    await record_person_moved(self.db, person.id, previous.evangelist_id, target.evangelist_id)
+                    moved_people.append((person, previous))
+            applied_people.append(person)
+
+        # Deleting something already gone is a no-op, so uploads can be retried
+        for person_id in upload.deleted.people:
+            person = people.get(person_id)
+            if person is None:
+                continue
+            report = reports[person.report_id]
+            self._ensure_access(report, current_user)
+            record_tombstone(self.db, ENTITY_PERSON, person.id, report.evangelist_id)
+            await self.db.delete(person)
+            deleted_people.append(person)
+        await self.db.flush()
+
+        doomed = [reports[i] for i in upload.deleted.reports if i in reports]
+        if doomed:
+            for report in doomed:
+                self._ensure_access(report, current_user)
+            remaining = await self.db.execute(
+                select(Person.id).where(Person.report_id.in_([r.id for r in doomed])).limit(1)
+            )
+            if remaining.first() is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Delete the people of a report before the report",
+                )
+            for report in doomed:
+                record_tombstone(self.db, ENTITY_REPORT, report.id, report.evangelist_id)
+                await self.db.delete(report)
+            await self.db.flush()
+
+        if applied_reports or doomed:
+            invalidate_on_commit(self.db, CACHE_TAG_REPORTS)
+        if applied_people or upload.deleted.people:
+            invalidate_on_commit(self.db, CACHE_TAG_PEOPLE)
+        for report in applied_reports:
+            live_events.emit(self.db, report_event(OP_CREATED if report.id in created else OP_UPDATED, report))
+        for person in applied_people:
+            op = OP_CREATED if person.id in created else OP_UPDATED
+            live_events.emit(self.db, person_event(op, person, reports[person.report_id].evangelist_id))
+        for person, previous in moved_people:
+            live_events.emit(self.db, person_moved_event(person, previous))
+        for person in deleted_people:
+            live_events.emit(self.db, person_event(OP_DELETED, person, reports[person.report_id].evangelist_id))
+        for report in doomed:
+            live_events.emit(self.db, report_event(OP_DELETED, report))
+
+        return SyncUploadResult(
+            reports=[ReportResponse.model_validate(r) for r in applied_reports],
+            people=[PersonResponse.model_validate(p) for p in applied_people],
+            conflicts=SyncConflicts(
+                reports=[ReportResponse.model_validate(r) for r in stale_reports],
+                people=[PersonResponse.model_validate(p) for p in stale_people],
+                deleted=gone,
+            ),
+        )
+
+
+# Clients whose watermark is older than the kept tombstones get 410 and resync from scratch
+tombstone_collector = ExpiredRowCollector(
+    "sync tombstones",
+    get_engine,
+    SyncTombstone.__table__,
+    SyncTombstone.deleted_at,
+    lambda: datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_TTL_DAYS),
+    settings.SYNC_TOMBSTONE_GC_INTERVAL_SECONDS,
+    settings.SYNC_TOMBSTONE_GC_BATCH_SIZE,
+)
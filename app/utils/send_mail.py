@@ -1,10 +1,14 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
+from app.core.metrics import EMAIL_SENDS
+from app.core.tracing import SPAN_KIND_CLIENT, tracer
 
 
 def send_email(to_email: str, subject: str, html_content: str):
+    # Only loaded when mail is actually sent, not at startup
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     sender_email = settings.SMTP_EMAIL
     sender_password = settings.SMTP_PASSWORD
 
@@ -15,7 +19,19 @@ def send_email(to_email: str, subject: str, html_content: str):
 
     msg.attach(MIMEText(html_content, "html"))
 
-    with smtplib.SMTP(settings.SMTP_SERVER, int(settings.SMTP_PORT)) as server:
-        server.starttls()
-        server.login(sender_email, sender_password)
-        server.sendmail(sender_email, to_email, msg.as_string())
\ No newline at end of file
+    try:
+        with tracer.span("smtp send", SPAN_KIND_CLIENT, **{"net.peer.name": settings.SMTP_SERVER}):
+            with smtplib.SMTP(settings.SMTP_SERVER, int(settings.SMTP_PORT)) as server:
+                server.starttls()
+                server.login(sender_email, sender_password)
+                server.sendmail(sender_email, to_email, msg.as_string())
+    except smtplib.SMTPAuthenticationError:
+        EMAIL_SENDS.labels("auth_error").inc()
+        raise
+    except smtplib.SMTPRecipientsRefused:
+        EMAIL_SENDS.labels("rejected").inc()
+        raise
+    except (smtplib.SMTPException, OSError):
+        EMAIL_SENDS.labels("error").inc()
+        raise
+    EMAIL_SENDS.labels("sent").inc()
\ No newline at end of file
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Type
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached TypeAdapter for list[model]; building one is expensive."""
+    return TypeAdapter(list[model])
+
+
+def json_list_response(
+    model: Type[BaseModel],
+    rows: Iterable[Any],
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Validate rows against list[model] in one pass and encode them straight to JSON bytes.
+
+    Returning the Response skips FastAPI's per-item response_model validation
+    and the stdlib json encoder. Keep response_model on the route so the
+    OpenAPI schema is unchanged.
+    """
+    adapter = list_adapter(model)
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(items),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
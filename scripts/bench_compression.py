@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Response compression benchmark for list endpoints.
+
+Renders a page of OutreachReport rows through json_list_response behind
+CompressionMiddleware and reports, for each available content-coding, the
+wire size, the server time per request, and the estimated time to deliver
+the page over a slow mobile link. No database is used.
+
+    python scripts/bench_compression.py --rows 1000 --bandwidth-kbps 1000
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+
+from app.core.compression import CompressionMiddleware, available_encoders
+from app.models.outreachReport import OutreachReport
+from app.schemas.report_schema import ReportResponse
+from app.utils.serialization import json_list_response
+
+
+def make_rows(count: int) -> List[OutreachReport]:
+    now = datetime.now(timezone.utc)
+    evangelists = [uuid.uuid4() for _ in range(20)]
+    return [
+        OutreachReport(
+            id=uuid.uuid4(),
+            evangelist_id=evangelists[i % len(evangelists)],
+            outreach_name=f"Gospel Week {i % 12}",
+            location="Bahir Dar",
+            date=date(2025, 1, 1) + timedelta(days=i % 365),
+            heard_count=i % 50,
+            interested_count=i % 20,
+            accepted_count=i % 10,
+            repented_count=i % 5,
+            notes="Met people at the market" if i % 3 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows) -> CompressionMiddleware:
+    app = FastAPI()
+
+    @app.get("/reports")
+    async def reports():
+        return json_list_response(ReportResponse, rows)
+
+    return CompressionMiddleware(app)
+
+
+async def call(app, accept_encoding: str) -> bytes:
+    """Drive one GET through the ASGI app and return the raw (encoded) body."""
+    body = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/reports",
+        "raw_path": b"/reports",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app, accept_encoding: str, iterations: int) -> float:
+    await call(app, accept_encoding)  # warm up caches and adapters
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, accept_encoding)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--bandwidth-kbps", type=float, default=1000, help="Link speed for the transfer estimate")
+    args = parser.parse_args()
+
+    app = build_app(make_rows(args.rows))
+    bytes_per_ms = args.bandwidth_kbps * 1000 / 8 / 1000
+
+    print(f"{args.rows} rows, {args.iterations} iterations, {args.bandwidth_kbps:.0f} kbit/s link")
+    print(f"  {'coding':<9} {'wire KiB':>9} {'ratio':>6} {'server ms':>10} {'transfer ms':>12} {'total ms':>9}")
+    identity_size = None
+    for coding in ["identity", *available_encoders()]:
+        size = len(await call(app, coding))
+        identity_size = identity_size or size
+        server_ms = await measure(app, coding, args.iterations)
+        transfer_ms = size / bytes_per_ms
+        print(
+            f"  {coding:<9} {size / 1024:9.1f} {identity_size / size:5.1f}x "
+            f"{server_ms:10.2f} {transfer_ms:12.1f} {server_ms + transfer_ms:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+HTTP load benchmark for the production launcher.
+
+For each worker count, starts `python -m app.server --workers N`, drives it
+with keep-alive HTTP/1.1 connections from several client processes (so the
+load generator is not the bottleneck), and reports throughput and latency.
+Throughput should grow close to linearly with workers up to the number of
+cores left over after the client processes.
+
+    python scripts/bench_http_load.py --workers 1 2 4 --path /health/live
+    python scripts/bench_http_load.py --workers 1 2 --path /api/reports/ --header "Authorization: Bearer ..."
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+
+async def connection_loop(host, port, request: bytes, deadline: float, latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    done = 0
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            done += 1
+    finally:
+        writer.close()
+    return done
+
+
+def client_process(host, port, request, connections, duration, queue):
+    async def run():
+        latencies: List[float] = []
+        deadline = time.perf_counter() + duration
+        counts = await asyncio.gather(*[
+            connection_loop(host, port, request, deadline, latencies) for _ in range(connections)
+        ])
+        return sum(counts), latencies
+
+    queue.put(asyncio.run(run()))
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start on {host}:{port}")
+
+
+def run_load(args, request: bytes) -> Tuple[float, List[float]]:
+    queue = multiprocessing.Queue()
+    per_client = max(1, args.connections // args.clients)
+    procs = [
+        multiprocessing.Process(
+            target=client_process,
+            args=(args.host, args.port, request, per_client, args.duration, queue),
+        )
+        for _ in range(args.clients)
+    ]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    total = sum(count for count, _ in results)
+    latencies = [lat for _, lats in results for lat in lats]
+    return total / args.duration, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--header", action="append", default=[], help="Extra request header, repeatable")
+    parser.add_argument("--connections", type=int, default=64, help="Total keep-alive connections")
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Client processes")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    args = parser.parse_args()
+
+    request = (
+        f"GET {args.path} HTTP/1.1\r\nHost: {args.host}\r\n"
+        + "".join(f"{h}\r\n" for h in args.header)
+        + "\r\n"
+    ).encode()
+
+    print(f"{args.path}: {args.connections} connections from {args.clients} client processes, {args.duration:.0f}s per run")
+    print(f"  {'workers':>7} {'req/s':>10} {'scaling':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    baseline = None
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--workers", str(workers),
+             "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT,
+            env={**os.environ, "WEB_CONCURRENCY": str(workers)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(args.host, args.port)
+            time.sleep(args.warmup)
+            rps, latencies = run_load(args, request)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        baseline = baseline or rps
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+        print(f"  {workers:>7} {rps:>10.0f} {rps / baseline:>7.2f}x {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Row mapping benchmark for read-only list endpoints.
+
+Seeds a page of outreach reports inside a transaction, then compares fetching
+it as mapped OutreachReport entities (identity map, instance state) with the
+column-level path used by ReportService.list_reports. CPU time and traced
+memory per row are reported. The transaction is rolled back at the end, so
+nothing is left behind in the database.
+
+    python scripts/bench_row_mapping.py --rows 10000
+    python scripts/bench_row_mapping.py --url postgresql+asyncpg://... --no-ssl
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import desc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import Base, build_engine
+from app.models.outreachReport import OutreachReport
+from app.models.user import User, UserRole
+from app.schemas.report_schema import ReportResponse
+from app.services.report_service import ReportService
+from app.utils.serialization import json_list_response
+
+
+async def seed(session: AsyncSession, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    evangelist_id = uuid.uuid4()
+    await session.execute(insert(User).values(
+        id=evangelist_id,
+        full_name="Bench Evangelist",
+        email=f"bench-{evangelist_id}@example.com",
+        password_hash="x",
+        role=UserRole.evangelist,
+    ))
+    await session.execute(insert(OutreachReport), [
+        {
+            "id": uuid.uuid4(),
+            "evangelist_id": evangelist_id,
+            "outreach_name": f"Gospel Week {i % 12}",
+            "location": "Bahir Dar",
+            "date": date(2025, 1, 1) + timedelta(days=i % 365),
+            "heard_count": i % 50,
+            "interested_count": i % 20,
+            "accepted_count": i % 10,
+            "repented_count": i % 5,
+            "notes": "Met people at the market" if i % 3 else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ])
+
+
+async def orm_page(session: AsyncSession, limit: int):
+    query = select(OutreachReport).order_by(desc(OutreachReport.date)).limit(limit)
+    result = await session.execute(query)
+    return json_list_response(ReportResponse, result.scalars().all())
+
+
+async def core_page(session: AsyncSession, limit: int):
+    admin = SimpleNamespace(id=None, role=UserRole.admin)
+    reports = await ReportService(session).list_reports(admin, 0, limit)
+    return json_list_response(ReportResponse, reports)
+
+
+async def measure(label, fn, session, rows, iterations):
+    await fn(session, rows)  # warm up statement caches and adapters
+    session.expunge_all()
+
+    start = time.process_time()
+    for _ in range(iterations):
+        await fn(session, rows)
+        session.expunge_all()
+    cpu_ms = (time.process_time() - start) / iterations * 1000
+
+    tracemalloc.start()
+    response = await fn(session, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.expunge_all()
+
+    print(
+        f"  {label:<8} {cpu_ms:9.1f} ms/page {cpu_ms * 1000 / rows:8.1f} us/row "
+        f"{peak / rows:9.0f} B/row peak  ({len(response.body) / 1024:.0f} KiB body)"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--no-ssl", action="store_true", help="Connect without TLS (local databases)")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--create-tables", action="store_true", help="Create tables first (empty scratch databases)")
+    args = parser.parse_args()
+
+    engine = build_engine(args.url, use_ssl=not args.no_ssl, name="bench")
+    async with engine.connect() as conn:
+        if args.create_tables:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.commit()
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False, autoflush=False)
+        try:
+            await seed(session, args.rows)
+            print(f"{args.rows} rows, {args.iterations} iterations")
+            await measure("orm", orm_page, session, args.rows, args.iterations)
+            await measure("core", core_page, session, args.rows, args.iterations)
+        finally:
+            await session.close()
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for list endpoints.
+
+Builds a page of OutreachReport rows in memory and measures the time to turn
+it into a JSON response body through FastAPI's default response_model path
+and through app.utils.serialization.json_list_response. No database is used.
+
+    python scripts/bench_serialization.py --rows 1000 --iterations 200
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+
+from app.models.outreachReport import OutreachReport
+from app.schemas.report_schema import ReportResponse
+from app.utils.serialization import json_list_response
+
+
+def make_rows(count: int) -> List[OutreachReport]:
+    now = datetime.now(timezone.utc)
+    evangelists = [uuid.uuid4() for _ in range(20)]
+    return [
+        OutreachReport(
+            id=uuid.uuid4(),
+            evangelist_id=evangelists[i % len(evangelists)],
+            outreach_name=f"Gospel Week {i % 12}",
+            location="Bahir Dar",
+            date=date(2025, 1, 1) + timedelta(days=i % 365),
+            heard_count=i % 50,
+            interested_count=i % 20,
+            accepted_count=i % 10,
+            repented_count=i % 5,
+            notes="Met people at the market" if i % 3 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=List[ReportResponse])
+    async def default_path():
+        return rows
+
+    @app.get("/fast", response_model=List[ReportResponse])
+    async def fast_path():
+        return json_list_response(ReportResponse, rows)
+
+    return app
+
+
+async def call(app, path: str) -> bytes:
+    """Drive one GET through the ASGI app and return the response body."""
+    body = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app, path: str, iterations: int) -> float:
+    await call(app, path)  # warm up caches and adapters
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, path)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    app = build_app(rows)
+
+    size = len(await call(app, "/fast"))
+    default_ms = await measure(app, "/default", args.iterations)
+    fast_ms = await measure(app, "/fast", args.iterations)
+
+    print(f"{args.rows} rows, {size / 1024:.1f} KiB per page, {args.iterations} iterations")
+    print(f"  response_model path : {default_ms:8.2f} ms/page")
+    print(f"  json_list_response  : {fast_ms:8.2f} ms/page  ({default_ms / fast_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
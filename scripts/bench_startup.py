@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark.
+
+Reports, each in a fresh interpreter:
+  - the slowest imports of `app.main` from `python -X importtime`
+  - time to import app.main and to build the app with create_app()
+  - time from process spawn to the first 200 from /health/live, and then
+    to the first /health (which opens a database connection)
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 5 --top 25
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+app.main.create_app()
+t2 = time.perf_counter()
+print(f"{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f}")
+"""
+
+
+def python(*args, **kwargs):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, **kwargs)
+
+
+def importtime_report(top: int) -> None:
+    result = python("-X", "importtime", "-c", "import app.main")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            rows.append((int(cumulative), name.strip()))
+        except ValueError:
+            continue
+    rows.sort(reverse=True)
+    total = rows[0][0] if rows else 0
+    print(f"import app.main: {total / 1000:.0f} ms cumulative (python -X importtime)")
+    for cumulative, name in rows[1:top + 1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, deadline: float) -> bool:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.01)
+    return False
+
+
+def first_request(timeout: float):
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:create_app", "--factory",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    try:
+        deadline = start + timeout
+        live = wait_for(f"http://127.0.0.1:{port}/health/live", deadline)
+        live_at = time.perf_counter() - start
+        ready = live and wait_for(f"http://127.0.0.1:{port}/health", deadline)
+        ready_at = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return (live_at if live else None), (ready_at if ready else None)
+
+
+def summary(values) -> str:
+    values = [v for v in values if v is not None]
+    if not values:
+        return "n/a"
+    return f"{statistics.median(values) * 1000:7.0f} ms median  ({min(values) * 1000:.0f}-{max(values) * 1000:.0f})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20, help="Slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    importtime_report(args.top)
+    print()
+
+    imports, builds = [], []
+    for _ in range(args.runs):
+        out = python("-c", IMPORT_SNIPPET, env={**os.environ, "PYTHONPATH": str(ROOT)})
+        if out.returncode != 0:
+            sys.exit(out.stderr)
+        import_ms, build_ms = map(float, out.stdout.split()[-2:])
+        imports.append(import_ms / 1000)
+        builds.append(build_ms / 1000)
+    print(f"import app.main        {summary(imports)}")
+    print(f"create_app()           {summary(builds)}")
+
+    lives, readies = [], []
+    for _ in range(args.runs):
+        live, ready = first_request(args.timeout)
+        lives.append(live)
+        readies.append(ready)
+    print(f"spawn -> /health/live  {summary(lives)}")
+    print(f"spawn -> /health       {summary(readies)}")
+
+
+if __name__ == "__main__":
+    main()
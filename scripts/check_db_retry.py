@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Fault-injection check of the database retry layer, without Postgres.
+
+Serves a small app through RetryMiddleware using the real get_db and
+get_uow dependencies on a scratch sqlite database. A cursor-execute hook
+stands in for Neon/asyncpg and raises the errors the asyncpg dialect
+produces (SQLAlchemy errors wrapping translated asyncpg exceptions), then
+verifies:
+  1. a read survives dropped connections and a compute that is still starting
+  2. a read that keeps failing gets 503 with Retry-After within its budget
+  3. a write without an Idempotency-Key is not re-run after a connection error
+  4. a write with a key is re-run with its body and commits once
+  5. serialization failures and stale prepared statements are retried for writes too
+  6. fatal errors (constraint violations) and non-database socket errors are not retried
+  7. a request that already committed is never re-run
+  8. backoff delays stay within their jittered bounds
+
+    python scripts/check_db_retry.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_scratch.name}"
+
+import asyncpg
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi as dbapi
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError, NotSupportedError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, get_engine
+from app.core.retry import RetryMiddleware, RetryPolicy
+from app.core.unit_of_work import after_commit, get_uow
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}")
+    return ok
+
+
+def translated(error: Exception, adapted_class, wrapper_class, **kwargs) -> Exception:
+    """Wrap an asyncpg exception the way the asyncpg dialect and SQLAlchemy do."""
+    adapted = adapted_class(f"{type(error)}: {error}")
+    adapted.pgcode = adapted.sqlstate = getattr(error, "sqlstate", None)
+    adapted.__cause__ = error
+    return wrapper_class("SELECT 1", (), adapted, **kwargs)
+
+
+FAULTS = {
+    "connection": lambda: translated(
+        asyncpg.exceptions.ConnectionDoesNotExistError("connection was closed in the middle of operation"),
+        dbapi.InterfaceError,
+        InterfaceError,
+        connection_invalidated=True,
+    ),
+    "starting": lambda: translated(
+        asyncpg.exceptions.CannotConnectNowError("the database system is starting up"),
+        dbapi.Error,
+        OperationalError,
+    ),
+    "serialization": lambda: translated(
+        asyncpg.exceptions.SerializationError("could not serialize access due to concurrent update"),
+        dbapi.Error,
+        OperationalError,
+    ),
+    "stale": lambda: translated(
+        asyncpg.exceptions.InvalidCachedStatementError("cached statement plan is invalid"),
+        dbapi.InvalidCachedStatementError,
+        NotSupportedError,
+    ),
+    "unique": lambda: translated(
+        asyncpg.exceptions.UniqueViolationError("duplicate key value violates unique constraint"),
+        dbapi.IntegrityError,
+        IntegrityError,
+    ),
+}
+
+
+class FaultInjector:
+    """Raise a fault from the next `times` statements that start with `verb`."""
+
+    def __init__(self):
+        self.fault = None
+        self.times = 0
+        self.verb = ""
+        self.executed = 0
+
+    def arm(self, fault: str, times: int, verb: str = "SELECT") -> None:
+        self.fault, self.times, self.verb, self.executed = fault, times, verb, 0
+
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(self.verb):
+            return
+        self.executed += 1
+        if self.times:
+            self.times -= 1
+            raise FAULTS[self.fault]()
+
+
+def build_app(injector: FaultInjector, policy: RetryPolicy) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RetryMiddleware, policy=policy)
+
+    @app.get("/items")
+    async def count_items(db: AsyncSession = Depends(get_db)):
+        result = await db.execute(text("SELECT count(*) FROM items"))
+        return {"count": result.scalar_one()}
+
+    @app.get("/items/cached")
+    async def cached_count(db: AsyncSession = Depends(get_db)):
+        await db.execute(text("SELECT count(*) FROM items"))
+        try:
+            raise ConnectionRefusedError(111, "Connect call failed")
+        except OSError as e:
+            # What a Redis client raises when its server is down
+            raise ConnectionError("Error 111 connecting to cache") from e
+
+    @app.post("/items")
+    async def create_item(payload: dict, db: AsyncSession = Depends(get_uow, scope="function")):
+        await db.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": payload["name"]})
+        db.info["wrote"] = True
+        return {"name": payload["name"]}
+
+    @app.post("/items/notify")
+    async def create_and_notify(payload: dict, db: AsyncSession = Depends(get_uow, scope="function")):
+        await db.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": payload["name"]})
+
+        def notify():
+            raise FAULTS["connection"]()
+
+        after_commit(db, notify)
+        return {"name": payload["name"]}
+
+    return app
+
+
+async def main() -> int:
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+
+    injector = FaultInjector()
+    event.listen(engine.sync_engine, "before_cursor_execute", injector.before_execute)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.05, max_delay=0.2, budget=1.0)
+    transport = httpx.ASGITransport(app=build_app(injector, policy), raise_app_exceptions=False)
+    results = True
+
+    async def rows() -> int:
+        async with engine.connect() as conn:
+            return (await conn.execute(text("SELECT count(*) FROM items"))).scalar_one()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        injector.arm("connection", 1)
+        response = await client.get("/items")
+        results &= check("read retried past a dropped connection", response.status_code == 200 and injector.executed == 2)
+
+        injector.arm("starting", 1)
+        response = await client.get("/items")
+        results &= check("read retried while the compute starts", response.status_code == 200 and injector.executed == 2)
+
+        injector.arm("connection", 10)
+        start = time.perf_counter()
+        response = await client.get("/items")
+        elapsed = time.perf_counter() - start
+        results &= check(
+            f"persistent failure: {response.status_code} after {injector.executed} attempts in {elapsed * 1000:.0f} ms",
+            response.status_code == 503
+            and "retry-after" in response.headers
+            and injector.executed == policy.max_attempts
+            and elapsed < policy.budget,
+        )
+
+        injector.arm("connection", 1, verb="INSERT")
+        response = await client.post("/items", json={"name": "unkeyed"})
+        results &= check(
+            "unkeyed write not re-run after a connection error",
+            response.status_code == 503 and injector.executed == 1 and await rows() == 0,
+        )
+
+        injector.arm("connection", 2, verb="INSERT")
+        response = await client.post("/items", json={"name": "keyed"}, headers={"Idempotency-Key": "k1"})
+        results &= check(
+            "keyed write re-run with its body and committed once",
+            response.status_code == 200 and response.json() == {"name": "keyed"} and await rows() == 1,
+        )
+
+        injector.arm("serialization", 1, verb="INSERT")
+        response = await client.post("/items", json={"name": "serialized"})
+        results &= check("serialization failure retried for an unkeyed write", response.status_code == 200 and await rows() == 2)
+
+        injector.arm("stale", 1, verb="INSERT")
+        response = await client.post("/items", json={"name": "stale"})
+        results &= check("stale prepared statement retried for an unkeyed write", response.status_code == 200 and await rows() == 3)
+
+        injector.arm("unique", 1, verb="INSERT")
+        response = await client.post("/items", json={"name": "dup"}, headers={"Idempotency-Key": "k2"})
+        results &= check("constraint violation not retried", response.status_code == 500 and injector.executed == 1)
+
+        injector.arm("connection", 0)
+        response = await client.get("/items/cached")
+        results &= check("cache socket error not retried", response.status_code == 500 and injector.executed == 1)
+
+        injector.arm("connection", 0, verb="INSERT")
+        response = await client.post("/items/notify", json={"name": "notify"}, headers={"Idempotency-Key": "k3"})
+        results &= check(
+            "committed request not re-run when an after-commit step fails",
+            response.status_code == 500 and injector.executed == 1 and await rows() == 4,
+        )
+
+    delays = [policy.backoff(attempt) for attempt in (1, 2, 3, 4) for _ in range(200)]
+    results &= check(
+        f"backoff jittered within [0, {policy.max_delay}] s (mean {sum(delays) / len(delays) * 1000:.0f} ms)",
+        all(0 <= d <= policy.max_delay for d in delays) and len(set(delays)) > 1,
+    )
+
+    await engine.dispose()
+    os.unlink(_scratch.name)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
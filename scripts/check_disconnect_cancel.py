@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Check that abandoned requests give their pooled connection back.
+
+Serves a small app using the real get_db dependency, DisconnectCancelMiddleware
+and statement-timeout handler with uvicorn, then:
+  1. opens several slow GETs that each hold a connection, drops the client
+     sockets, and checks pool occupancy falls back to zero right away
+  2. on Postgres, runs a query longer than its budget and checks it is
+     cancelled by statement_timeout with a 503
+
+On sqlite (the default from .env may be Postgres) the slow query is
+simulated by holding the connection while sleeping.
+
+    python scripts/check_disconnect_cancel.py
+    python scripts/check_disconnect_cancel.py --requests 20 --hold 30
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import pool_metrics
+from app.core.config import settings
+from app.core.database import get_db, get_engine
+from app.core.disconnect import DisconnectCancelMiddleware
+from app.core.statement_timeout import StatementTimeout, statement_timeout_handler
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}")
+    return ok
+
+
+def build_app(hold: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(DisconnectCancelMiddleware)
+    app.add_exception_handler(StatementTimeout, statement_timeout_handler)
+
+    @app.get("/slow")
+    async def slow(db: AsyncSession = Depends(get_db)):
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": hold})
+        else:
+            await db.connection()
+            await asyncio.sleep(hold)
+        return {"done": True}
+
+    @app.get("/over-budget")
+    async def over_budget(db: AsyncSession = Depends(get_db)):
+        seconds = settings.STATEMENT_TIMEOUT_READ_MS / 1000 + 2
+        await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+        return {"done": True}
+
+    return app
+
+
+def checked_out() -> int:
+    pool = pool_metrics.registry["primary"].engine.pool
+    return pool.checkedout()
+
+
+async def open_request(port: int, path: str) -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+    return sock
+
+
+async def main(args) -> int:
+    app = build_app(args.hold)
+    config = uvicorn.Config(app, port=args.port, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    results = True
+    try:
+        sockets = [await open_request(args.port, "/slow") for _ in range(args.requests)]
+        await asyncio.sleep(1.0)
+        held = checked_out()
+        print(f"{args.requests} slow requests holding {held} connections")
+
+        start = time.perf_counter()
+        for sock in sockets:
+            sock.close()
+        while checked_out() and time.perf_counter() - start < args.hold:
+            await asyncio.sleep(0.01)
+        released_in = time.perf_counter() - start
+        results &= check(f"connections returned {released_in * 1000:.0f} ms after the clients left", checked_out() == 0)
+
+        if get_engine().dialect.name == "postgresql":
+            start = time.perf_counter()
+            reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+            writer.write(b"GET /over-budget HTTP/1.1\r\nHost: test\r\n\r\n")
+            status_line = await reader.readline()
+            writer.close()
+            elapsed = time.perf_counter() - start
+            budget = settings.STATEMENT_TIMEOUT_READ_MS / 1000
+            results &= check(
+                f"over-budget query answered {status_line.decode().strip()!r} after {elapsed:.1f}s (budget {budget:.1f}s)",
+                b" 503 " in status_line and elapsed < budget + 1,
+            )
+        else:
+            print("  [skip] statement_timeout needs Postgres")
+    finally:
+        server.should_exit = True
+        await serving
+        await get_engine().dispose()
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--hold", type=float, default=20.0, help="Seconds each slow request holds its connection")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Check live change events: delivery on commit, role filtering and backpressure.
+
+Runs a hub against stand-in WebSockets (one of them stalls like a client on
+a dead network) and a scratch sqlite database for the unit of work, then
+verifies:
+  1. events staged in a session reach subscribers only when it commits
+  2. admins see every change, evangelists only their own
+  3. events queued during a send go out together in one message
+  4. a subscriber that falls behind gets one resync event instead of its backlog
+  5. a subscriber whose socket stalls is disconnected with 1013
+  6. large commits are summarised as bulk events
+  7. events from other workers (postgres backend) are delivered, resync after a reconnect
+  8. subscribers beyond the limit are refused
+  9. a person moved to another evangelist's report leaves the old owner's view
+
+    python scripts/check_live_events.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import uuid
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_scratch.name}"
+
+from starlette.websockets import WebSocketState
+
+from app.core.database import get_engine, get_session_factory, init_db
+from app.core.invalidation import invalidation_bus
+from app.core.live_events import (
+    EVENT_REPORT,
+    OP_BULK,
+    OP_DELETED,
+    OP_UPDATED,
+    RESYNC,
+    TOPIC_LIVE_EVENTS,
+    LiveEventHub,
+    live_events,
+)
+from app.core.unit_of_work import commit
+from app.models.outreachReport import OutreachReport
+from app.models.person import Person
+from app.models.user import User, UserRole
+from app.schemas.person_schema import PersonUpdate
+from app.schemas.sync_schema import SyncPersonUpsert, SyncUpload
+from app.services.person_service import PersonService
+from app.services.sync_service import SyncService
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}")
+    return ok
+
+
+def event_for(owner: User) -> dict:
+    return {"type": EVENT_REPORT, "op": OP_UPDATED, "id": str(uuid.uuid4()), "evangelist_id": str(owner.id)}
+
+
+class FakeWebSocket:
+    """Collects sent messages; with stalled set, sends never complete."""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.sent = []
+        self.closed_with = None
+        self.application_state = WebSocketState.CONNECTED
+        self.gone = asyncio.Event()
+
+    async def send_text(self, text: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(text))
+
+    async def receive(self) -> dict:
+        await self.gone.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+        self.application_state = WebSocketState.DISCONNECTED
+
+
+async def main() -> int:
+    admin = User(id=uuid.uuid4(), role=UserRole.admin)
+    alice = User(id=uuid.uuid4(), role=UserRole.evangelist)
+    bob = User(id=uuid.uuid4(), role=UserRole.evangelist)
+    hub = LiveEventHub("memory", queue_size=4, send_timeout=0.2, max_subscribers=3)
+    results = True
+
+    # 1-3: delivery on commit, filtering and batching
+    sockets = {user.id: FakeWebSocket() for user in (admin, alice, bob)}
+    subscribers = {user.id: hub.subscribe(user) for user in (admin, alice, bob)}
+    streams = [
+        asyncio.create_task(hub.stream(sockets[user_id], subscriber))
+        for user_id, subscriber in subscribers.items()
+    ]
+
+    async with get_session_factory()() as session:
+        hub.emit(session, event_for(alice))
+        hub.emit(session, event_for(bob))
+        await asyncio.sleep(0.05)
+        results &= check("nothing delivered before the commit", not any(s.sent for s in sockets.values()))
+        await commit(session)
+    await asyncio.sleep(0.05)
+    async with get_session_factory()() as session:
+        hub.emit(session, event_for(alice))
+        await session.rollback()
+    await asyncio.sleep(0.05)
+
+    def received(user: User) -> list:
+        return [event for message in sockets[user.id].sent for event in message]
+
+    results &= check("admin sees both changes", len(received(admin)) == 2)
+    results &= check(
+        "evangelists see only their own",
+        [e["evangelist_id"] for e in received(alice)] == [str(alice.id)]
+        and [e["evangelist_id"] for e in received(bob)] == [str(bob.id)],
+    )
+    results &= check("events of one commit go out in one message", len(sockets[admin.id].sent) == 1)
+    results &= check("rolled back events are dropped", len(received(alice)) == 1)
+
+    # 8: no room for a fourth subscriber
+    results &= check("subscriber beyond the limit refused", hub.subscribe(bob) is None)
+
+    for socket in sockets.values():
+        socket.gone.set()
+    await asyncio.gather(*streams)
+    for subscriber in subscribers.values():
+        hub.unsubscribe(subscriber)
+    results &= check("subscribers removed on disconnect", not hub.subscribers)
+
+    # 4-5: a stalled client
+    stalled = FakeWebSocket(stalled=True)
+    subscriber = hub.subscribe(alice)
+    hub.deliver([event_for(alice) for _ in range(10)])
+    backlog = subscriber.take(await subscriber.queue.get())
+    results &= check("backlog replaced by a single resync event", backlog == [RESYNC])
+    hub.deliver([event_for(alice)])
+    await asyncio.wait_for(hub.stream(stalled, subscriber), timeout=2)
+    results &= check("stalled socket closed with 1013", stalled.closed_with == 1013)
+    hub.unsubscribe(subscriber)
+
+    # 6: a big sync upload
+    subscriber = hub.subscribe(admin)
+    async with get_session_factory()() as session:
+        for _ in range(25):
+            hub.emit(session, event_for(alice))
+        hub.emit(session, event_for(bob))
+        await commit(session)
+    bulk = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+    results &= check(
+        f"26 changes summarised as {len(bulk)} bulk events",
+        sorted(e["count"] for e in bulk) == [1, 25] and all(e["op"] == OP_BULK for e in bulk),
+    )
+    hub.unsubscribe(subscriber)
+
+    # 7: another worker's events arrive through the invalidation bus
+    shared = LiveEventHub("postgres", queue_size=4, send_timeout=0.2, max_subscribers=3)
+    subscriber = shared.subscribe(bob)
+    await invalidation_bus.dispatch(TOPIC_LIVE_EVENTS, {"events": [event_for(alice), event_for(bob)]})
+    await invalidation_bus.resync()
+    remote = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+    results &= check(
+        "remote events filtered and resync sent after a reconnect",
+        len(remote) == 2 and remote[0]["evangelist_id"] == str(bob.id) and remote[1] == RESYNC,
+    )
+
+    # 9: moves through the REST API and through sync, both made by an admin
+    await init_db()
+    async with get_session_factory()() as session:
+        for user in (admin, alice, bob):
+            session.add(User(
+                id=user.id, full_name="Check", email=f"{user.id}@example.com",
+                password_hash="x", role=user.role,
+            ))
+        alices, bobs = (
+            OutreachReport(id=uuid.uuid4(), evangelist_id=owner.id, outreach_name="O", location="L", date=date.today())
+            for owner in (alice, bob)
+        )
+        person = Person(id=uuid.uuid4(), report_id=alices.id, full_name="P", status="interested")
+        session.add_all([alices, bobs, person])
+        await commit(session)
+
+    def rest_move(session, report):
+        return PersonService(session).update_person(person.id, PersonUpdate(report_id=report.id), admin)
+
+    def sync_move(session, report):
+        upsert = SyncPersonUpsert(id=person.id, report_id=report.id, full_name="P", status="interested")
+        return SyncService(session).apply(admin, SyncUpload(people=[upsert]))
+
+    for label, move, source, target in (("REST", rest_move, alices, bobs), ("sync", sync_move, bobs, alices)):
+        subscribers = {user.id: live_events.subscribe(user) for user in (alice, bob)}
+        async with get_session_factory()() as session:
+            await move(session, target)
+            await commit(session)
+        seen = {
+            user_id: [
+                (e["op"], e["report_id"])
+                for e in (subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize()))
+            ]
+            for user_id, subscriber in subscribers.items()
+        }
+        results &= check(
+            f"{label}: old owner told the person is gone, new owner of the update",
+            seen[source.evangelist_id] == [(OP_DELETED, str(source.id))]
+            and seen[target.evangelist_id] == [(OP_UPDATED, str(target.id))],
+        )
+        for subscriber in subscribers.values():
+            live_events.unsubscribe(subscriber)
+
+    await get_engine().dispose()
+    os.unlink(_scratch.name)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
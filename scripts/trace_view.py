@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Print span trees from the JSON-lines trace file written with
+TRACING_EXPORTER=file, slowest traces first.
+
+    python scripts/trace_view.py logs/traces.jsonl --route "POST /api/auth/login" --top 3
+"""
+import argparse
+import json
+from collections import defaultdict
+
+
+def load(path):
+    traces = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def print_tree(spans):
+    children = defaultdict(list)
+    ids = {span["span_id"] for span in spans}
+    roots = []
+    for span in sorted(spans, key=lambda s: s["start_ns"]):
+        if span["parent_id"] in ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+
+    def walk(span, depth, trace_start):
+        offset = (span["start_ns"] - trace_start) / 1e6
+        error = f"  !! {span['error']}" if span.get("error") else ""
+        print(f"  {offset:8.1f} ms {span['duration_ms']:9.1f} ms  {'  ' * depth}{span['name']}{error}")
+        for child in children[span["span_id"]]:
+            walk(child, depth + 1, trace_start)
+
+    for root in roots:
+        walk(root, 0, root["start_ns"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", default="logs/traces.jsonl")
+    parser.add_argument("--route", help='Only traces whose root span has this name, e.g. "POST /api/auth/login"')
+    parser.add_argument("--top", type=int, default=5, help="How many of the slowest traces to show")
+    args = parser.parse_args()
+
+    selected = []
+    for spans in load(args.path).values():
+        roots = [s for s in spans if s["parent_id"] is None or s.get("kind") == 2]
+        if not roots:
+            continue
+        root = max(roots, key=lambda s: s["duration_ms"])
+        if args.route and root["name"] != args.route:
+            continue
+        selected.append((root["duration_ms"], spans))
+
+    for duration, spans in sorted(selected, key=lambda item: item[0], reverse=True)[:args.top]:
+        print(f"trace {spans[0]['trace_id']}  {duration:.1f} ms")
+        print(f"  {'start':>11} {'duration':>12}  span")
+        print_tree(spans)
+        print()
+
+
+if __name__ == "__main__":
+    main()